@@ -1,63 +1,141 @@
 # Script pour analyser et corriger le fichier HTML
 
+import mmap
+import os
 import re
 import sys
 
+# Motifs compilés une seule fois au chargement du module.
+# Ils travaillent en bytes pour pouvoir être appliqués directement sur le mmap.
+_RE_DISPLAY = re.compile(rb'function\s+updateJoystickDisplay\s*\(\s*joysticks\s*\)\s*\{')
+_RE_UPDATE = re.compile(rb'function\s+updateJoystick\s*\(\s*index\s*,\s*([^)]+)\)\s*\{')
+_RE_VALUES = re.compile(rb'joystickValues\w*\[\s*(\d+)\s*\]')
+_RE_VARS = re.compile(rb'const\s+(joystick\w+)\s*=\s*\[')
+
+_DIV_OPEN = b'<div'
+_DIV_CLOSE = b'</div>'
+_JOYSTICK_CLASS = b'class="joystick'
+
+def _is_joystick_div(content, open_pos):
+    """Vérifier si la balise <div ouverte à open_pos a une classe joystick."""
+    i = open_pos + len(_DIV_OPEN)
+    j = i
+    while j < len(content) and content[j:j + 1].isspace():
+        j += 1
+    return j > i and content[j:j + len(_JOYSTICK_CLASS)] == _JOYSTICK_CLASS
+
+def find_joystick_spans(content):
+    """Localiser les blocs <div class="joystick..."> en un seul parcours linéaire.
+
+    Chaque bloc s'étend de la balise ouvrante jusqu'au premier </div> suivi
+    (après d'éventuels blancs) d'un second </div>, comme le faisait l'ancienne
+    regex <div\\s+class="joystick.*?</div>\\s*</div>, mais sans retour arrière.
+    La recherche reprend après la fin de chaque bloc trouvé.
+    content peut être un objet bytes ou un mmap.
+
+    Returns:
+        Liste de tuples (début, fin) en offsets dans content
+    """
+    spans = []
+    pos = content.find(_DIV_OPEN)
+
+    while pos != -1:
+        if not _is_joystick_div(content, pos):
+            pos = content.find(_DIV_OPEN, pos + len(_DIV_OPEN))
+            continue
+
+        end = -1
+        close = content.find(_DIV_CLOSE, pos + len(_DIV_OPEN))
+        while close != -1:
+            j = close + len(_DIV_CLOSE)
+            while j < len(content) and content[j:j + 1].isspace():
+                j += 1
+            if content[j:j + len(_DIV_CLOSE)] == _DIV_CLOSE:
+                end = j + len(_DIV_CLOSE)
+                break
+            close = content.find(_DIV_CLOSE, j)
+
+        if end == -1:
+            break
+        spans.append((pos, end))
+        pos = content.find(_DIV_OPEN, end)
+
+    return spans
+
+def find_joystick_elements(content):
+    """Extraire les blocs <div class="joystick..."> (voir find_joystick_spans)."""
+    return [content[start:end] for start, end in find_joystick_spans(content)]
+
+def _decode(data):
+    """Décoder un petit extrait du fichier pour l'affichage."""
+    return data.decode('utf-8', errors='replace')
+
+def _char_offset(content, pos):
+    """Convertir un offset en octets en position en caractères, comme sur le texte décodé."""
+    return len(_decode(content[:pos]))
+
+def _report(content):
+    """Afficher les résultats de l'analyse pour content (bytes ou mmap)."""
+    # Rechercher les fonctions clés
+    joystick_display_match = _RE_DISPLAY.search(content)
+    joystick_update_match = _RE_UPDATE.search(content)
+
+    print("=== HTML Analysis Results ===")
+
+    if joystick_display_match:
+        print(f"✅ Found updateJoystickDisplay function at position {_char_offset(content, joystick_display_match.start())}")
+
+        # Extract and print 5 lines after the match
+        function_start = _decode(content[joystick_display_match.start():joystick_display_match.start() + 500])
+        print("\nFunction start:")
+        print(function_start[:function_start.find('\n', 300)]+"...")
+    else:
+        print("❌ updateJoystickDisplay function not found")
+
+    if joystick_update_match:
+        print(f"\n✅ Found updateJoystick function at position {_char_offset(content, joystick_update_match.start())}")
+        params = _decode(joystick_update_match.group(1))
+        print(f"   Parameters: {params}")
+
+        # Extract and print 5 lines after the match
+        function_start = _decode(content[joystick_update_match.start():joystick_update_match.start() + 500])
+        print("\nFunction start:")
+        print(function_start[:function_start.find('\n', 300)]+"...")
+    else:
+        print("❌ updateJoystick function not found")
+
+    # Vérifier le HTML des joysticks
+    joystick_elements = find_joystick_elements(content)
+    print(f"\nFound {len(joystick_elements)} joystick elements in HTML")
+
+    if joystick_elements:
+        print("\nExample joystick HTML structure:")
+        print(_decode(joystick_elements[0][:300])+"...")
+
+    # Rechercher les références aux valeurs de joystick
+    joystick_values_refs = _RE_VALUES.findall(content)
+    print(f"\nFound {len(joystick_values_refs)} references to joystick values arrays")
+
+    # Identifier les variables joystick
+    joystick_vars = _RE_VARS.findall(content)
+    print("\nJoystick-related variables:")
+    for var in joystick_vars:
+        print(f"- {_decode(var)}")
+
 def analyze_html_file(file_path):
     """Analyser le fichier HTML pour identifier les problèmes liés aux joysticks."""
     try:
-        # Lire le fichier HTML
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Rechercher les fonctions clés
-        joystick_display_match = re.search(r'function\s+updateJoystickDisplay\s*\(\s*joysticks\s*\)\s*\{', content)
-        joystick_update_match = re.search(r'function\s+updateJoystick\s*\(\s*index\s*,\s*([^)]+)\)\s*\{', content)
-        
-        print("=== HTML Analysis Results ===")
-        
-        if joystick_display_match:
-            print(f"✅ Found updateJoystickDisplay function at position {joystick_display_match.start()}")
-            
-            # Extract and print 5 lines after the match
-            function_start = content[joystick_display_match.start():joystick_display_match.start() + 500]
-            print("\nFunction start:")
-            print(function_start[:function_start.find('\n', 300)]+"...")
-        else:
-            print("❌ updateJoystickDisplay function not found")
-        
-        if joystick_update_match:
-            print(f"\n✅ Found updateJoystick function at position {joystick_update_match.start()}")
-            params = joystick_update_match.group(1)
-            print(f"   Parameters: {params}")
-            
-            # Extract and print 5 lines after the match
-            function_start = content[joystick_update_match.start():joystick_update_match.start() + 500]
-            print("\nFunction start:")
-            print(function_start[:function_start.find('\n', 300)]+"...")
-        else:
-            print("❌ updateJoystick function not found")
-        
-        # Vérifier le HTML des joysticks
-        joystick_elements = re.findall(r'<div\s+class="joystick.*?</div>\s*</div>', content, re.DOTALL)
-        print(f"\nFound {len(joystick_elements)} joystick elements in HTML")
-        
-        if joystick_elements:
-            print("\nExample joystick HTML structure:")
-            print(joystick_elements[0][:300]+"...")
-        
-        # Rechercher les références aux valeurs de joystick
-        joystick_values_refs = re.findall(r'joystickValues\w*\[\s*(\d+)\s*\]', content)
-        print(f"\nFound {len(joystick_values_refs)} references to joystick values arrays")
-        
-        # Identifier les variables joystick
-        joystick_vars = re.findall(r'const\s+(joystick\w+)\s*=\s*\[', content)
-        print("\nJoystick-related variables:")
-        for var in joystick_vars:
-            print(f"- {var}")
-        
+        # mmap refuse les fichiers vides : les analyser comme un contenu vide
+        if os.path.getsize(file_path) == 0:
+            _report(b"")
+            return True
+
+        # Projeter le fichier HTML en mémoire plutôt que de le copier dans une str
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            _report(content)
+
         return True
-    
+
     except Exception as e:
         print(f"Error analyzing HTML file: {e}")
         return False
@@ -67,5 +145,5 @@ if __name__ == "__main__":
         file_path = sys.argv[1]
     else:
         file_path = r"e:\crochetage\lockbox\templates\serrure.html"
-    
+
     analyze_html_file(file_path)
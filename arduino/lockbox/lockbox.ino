@@ -34,6 +34,12 @@ int led1Intensity = 0;
 int led2Intensity = 0;
 int led3Intensity = 0;
 
+// Joystick frame format sent to the PC:
+// 0 = ASCII <J1X,J1Y,J2X,J2Y,J3X,J3Y>
+// 1 = binary '<' + six uint16 little-endian values + '>' (14 bytes)
+// The Python controller must be created with binary_protocol=True to match.
+#define BINARY_PROTOCOL 0
+
 // Communication protocol constants
 const char START_MARKER = '<';
 const char END_MARKER = '>';
@@ -48,6 +54,9 @@ void setup() {
   // Initialize serial communication
   Serial.begin(9600);
   
+  // Tell the PC it can send commands now (it waits for this after a reset)
+  Serial.println("<READY>");
+  
   // Configure LED pins as outputs
   pinMode(LED_1_PIN, OUTPUT);
   pinMode(LED_2_PIN, OUTPUT);
@@ -94,6 +103,17 @@ void readJoysticks() {
 }
 
 void sendJoystickData() {
+#if BINARY_PROTOCOL
+  // Format: '<' J1X J1Y J2X J2Y J3X J3Y '>' (uint16, little-endian like the AVR)
+  uint16_t values[6] = {
+    (uint16_t)joystick1X, (uint16_t)joystick1Y,
+    (uint16_t)joystick2X, (uint16_t)joystick2Y,
+    (uint16_t)joystick3X, (uint16_t)joystick3Y
+  };
+  Serial.write(START_MARKER);
+  Serial.write((uint8_t*)values, sizeof(values));
+  Serial.write(END_MARKER);
+#else
   // Format: <J1X,J1Y,J2X,J2Y,J3X,J3Y>
   Serial.print(START_MARKER);
   Serial.print("J");
@@ -109,6 +129,7 @@ void sendJoystickData() {
   Serial.print(SEPARATOR);
   Serial.print(joystick3Y);
   Serial.println(END_MARKER);
+#endif
 }
 
 void receiveData() {
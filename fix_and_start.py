@@ -1,18 +1,27 @@
 # Script pour fixer les problèmes de serveur et démarrer
 
+import mmap
 import os
 import sys
-import re
 import time
 import webbrowser
 import subprocess
 import shutil
 from pathlib import Path
 
+# Chemins résolus depuis la racine du projet
+PROJECT_ROOT = Path(__file__).parent.absolute()
+SERVER_DIR = PROJECT_ROOT / "server"
+TEMPLATES_DIR = PROJECT_ROOT / "templates"
+
+# Ancres délimitant le bloc remplacé par apply_joystick_fixes (en bytes, cherchées dans le mmap)
+JOYSTICK_DISPLAY_ANCHOR = b"function updateJoystickDisplay(joysticks)"
+UPDATE_LED_ANCHOR = b"function updateLED("
+
 def create_backup():
     """Créer une sauvegarde du fichier HTML s'il n'existe pas déjà."""
-    html_file = r"e:\crochetage\lockbox\templates\serrure.html"
-    backup_file = r"e:\crochetage\lockbox\templates\serrure.html.backup"
+    html_file = TEMPLATES_DIR / "serrure.html"
+    backup_file = TEMPLATES_DIR / "serrure.html.backup"
     
     if not os.path.exists(backup_file) and os.path.exists(html_file):
         print("📁 Création d'une sauvegarde de serrure.html...")
@@ -22,30 +31,34 @@ def create_backup():
 
 def apply_joystick_fixes():
     # Chemin du fichier HTML
-    html_file = r"e:\crochetage\lockbox\templates\serrure.html"
-    js_file = r"e:\crochetage\lockbox\templates\fix_joystick.js"
-    
-    # Lire le fichier js avec les correctifs
-    with open(js_file, 'r', encoding='utf-8') as f:
-        fix_content = f.read()
+    html_file = TEMPLATES_DIR / "serrure.html"
+    js_file = TEMPLATES_DIR / "fix_joystick.js"
     
-    # Lire le fichier HTML
-    with open(html_file, 'r', encoding='utf-8') as f:
-        html_content = f.read()
+    # Lire le fichier js avec les correctifs (copié en entier dans le résultat)
+    fix_content = js_file.read_bytes()
     
-    # Chercher la fonction updateJoystickDisplay et le bloc qui la contient
-    joystick_pattern = r'function updateJoystickDisplay\(joysticks\).*?function updateLED\('
-    match = re.search(joystick_pattern, html_content, re.DOTALL)
+    new_html = None
+    # mmap refuse les fichiers vides : aucun bloc à remplacer dans ce cas
+    if os.path.getsize(html_file) > 0:
+        # Projeter le fichier HTML en mémoire et y chercher la fonction
+        # updateJoystickDisplay et le début de updateLED qui la suit
+        with open(html_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as html_content:
+            start = html_content.find(JOYSTICK_DISPLAY_ANCHOR)
+            end = html_content.find(UPDATE_LED_ANCHOR, start) if start != -1 else -1
+            
+            if start != -1 and end != -1:
+                # Remplacer le bloc par découpage, sans second parcours du document
+                new_html = b"".join((
+                    html_content[:start],
+                    fix_content,
+                    b"\n\n        ",
+                    html_content[end:]
+                ))
     
-    if match:
-        # Construire le contenu de remplacement
-        replacement = fix_content + "\n\n        function updateLED("
-        
-        # Remplacer le bloc
-        new_html = html_content.replace(match.group(0), replacement)
-        
+    # Le mmap est fermé avant la réécriture (Windows refuse de tronquer un fichier projeté)
+    if new_html is not None:
         # Sauvegarder le fichier modifié
-        with open(html_file, 'w', encoding='utf-8') as f:
+        with open(html_file, 'wb') as f:
             f.write(new_html)
         
         print("✅ Joystick fixes applied to HTML file")
@@ -63,11 +76,15 @@ def main():
     if joystick_fixes_applied:
         print("🚀 Starting Lockbox Server")
         
-        # Changer le répertoire de travail
-        os.chdir(r"e:\crochetage\lockbox\server")
+        # Démarrer le serveur dans ce processus plutôt que de lancer un second interpréteur
+        sys.path.insert(0, str(SERVER_DIR))
+        import ws_server
         
-        # Démarrer le serveur
-        os.system("python ws_server.py")
+        try:
+            # run() installe uvloop si disponible et gère l'arrêt, comme les autres lanceurs
+            ws_server.run([])
+        except KeyboardInterrupt:
+            pass
     else:
         print("❌ Fixes could not be applied, server not started")
         return 1
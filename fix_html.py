@@ -2,25 +2,51 @@
 Script pour corriger l'erreur dans serrure.html
 """
 
-import re
+import mmap
+import os
+
+HTML_FILE = "templates/serrure.html"
+
+ADMIN_ANCHOR = b"processAdminResponse(data) {"
+JOYSTICK_COMMENT_ANCHOR = b"// Update joystick display based on data"
+JOYSTICK_FUNCTION_ANCHOR = b"function updateJoystickDisplay(joysticks) {"
+LED_ANCHOR = b"// Update LED display based on data"
 
 def fix_serrure_html():
-    # Lire le fichier complet
-    with open("templates/serrure.html", "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    # Rechercher et supprimer la première définition incorrecte de updateJoystickDisplay
-    # La première définition se trouve après processAdminResponse et avant updateArduinoStatus
-    pattern = r'(processAdminResponse\(data\) \{.*?\}\s*}\s*)// Update joystick display based on data\s*function updateJoystickDisplay\(joysticks\) \{.*?// Update LED display based on data'
-    
-    # Utiliser re.DOTALL pour que le point corresponde aussi aux sauts de ligne
-    content_fixed = re.sub(pattern, r'\1// Update joystick display (using function defined below)\n\n        // Update LED display based on data', content, flags=re.DOTALL)
-    
-    # Écrire le contenu corrigé
-    with open("templates/serrure.html", "w", encoding="utf-8") as f:
+    # mmap refuse les fichiers vides, et un fichier vide n'a rien à corriger
+    if os.path.getsize(HTML_FILE) == 0:
+        print("Le fichier serrure.html est vide, aucune correction appliquée.")
+        return False
+
+    # Projeter le fichier en mémoire pour la recherche des ancres
+    with open(HTML_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+        # Rechercher et supprimer la première définition incorrecte de updateJoystickDisplay
+        # La première définition se trouve après processAdminResponse et avant updateArduinoStatus.
+        # Les ancres sont des chaînes littérales : on les localise successivement avec
+        # find plutôt qu'avec une regex .*? qui pourrait revenir en arrière sur tout le fichier.
+        start = content.find(ADMIN_ANCHOR)
+        mid = content.find(JOYSTICK_COMMENT_ANCHOR, start) if start != -1 else -1
+        func = content.find(JOYSTICK_FUNCTION_ANCHOR, mid) if mid != -1 else -1
+        end = content.find(LED_ANCHOR, func) if func != -1 else -1
+
+        if end == -1:
+            print("Définition en double de updateJoystickDisplay introuvable, aucune correction appliquée.")
+            return False
+
+        content_fixed = b"".join((
+            content[:mid],
+            b"// Update joystick display (using function defined below)\n\n        ",
+            content[end:],
+        ))
+
+    # Écrire le contenu corrigé dans un fichier temporaire puis le substituer atomiquement
+    tmp_file = HTML_FILE + ".tmp"
+    with open(tmp_file, "wb") as f:
         f.write(content_fixed)
-    
+    os.replace(tmp_file, HTML_FILE)
+
     print("Le fichier serrure.html a été corrigé.")
+    return True
 
 if __name__ == "__main__":
     fix_serrure_html()
@@ -8,24 +8,38 @@ and starts it with the correct configuration.
 
 import os
 import sys
+import mmap
 import logging
-import subprocess
-import time
+import threading
 import shutil
 import webbrowser
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+from start_lockbox import wait_for_server
 
 logger = logging.getLogger("LockboxStartup")
 
+def configure_logging():
+    """Send this script's messages to the console.
+    
+    Only the startup logger is configured: the root logger is left to
+    app_game_control and ws_server, which set up their own queued handlers
+    and log files when they are imported.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def open_browser_when_ready(url):
+    """Open url once the server accepts connections."""
+    if wait_for_server():
+        logger.info(f"Opening browser at {url}")
+        webbrowser.open(url)
+    else:
+        logger.warning(f"Server not reachable, open {url} manually once it is running")
+
 def get_project_root():
     """Get the absolute path to the project root directory."""
     return Path(__file__).parent.absolute()
@@ -33,40 +47,43 @@ def get_project_root():
 def inject_js_fix(html_file, js_file):
     """Inject the JavaScript fix into the HTML file."""
     try:
-        # Read the HTML file
-        with open(html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
         # Read the JS fix
         with open(js_file, 'r', encoding='utf-8') as f:
             js_content = f.read()
         
-        # Check if the script is already included
-        if "fixed_joystick.js" in html_content:
-            logger.info("JS fix already injected into HTML file.")
-            return True
+        # Map the HTML file instead of decoding it: the markers searched below
+        # are ASCII, so they can be found on the raw bytes
+        tmp_file = html_file + '.tmp'
+        with open(html_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as html_content:
+            # Check if the script is already included
+            if html_content.find(b"fixed_joystick.js") != -1:
+                logger.info("JS fix already injected into HTML file.")
+                return True
+            
+            # Find the position to insert the script (before the closing </body> tag)
+            insert_pos = html_content.rfind(b'</body>')
+            if insert_pos == -1:
+                logger.error("Could not find </body> tag in HTML file.")
+                return False
+            
+            # Create a script tag with the JS content
+            script_tag = f'\n<script>\n// Fixed joystick handlers\n{js_content}\n</script>\n'
+            
+            # Create a backup of the original file
+            backup_file = html_file + '.backup'
+            if not os.path.exists(backup_file):
+                shutil.copy2(html_file, backup_file)
+                logger.info(f"Created backup of HTML file at {backup_file}")
+            
+            # Write the modified HTML piece by piece instead of building the whole
+            # document in memory; the original bytes are copied without decoding
+            with open(tmp_file, 'wb') as out, memoryview(html_content) as view:
+                out.write(view[:insert_pos])
+                out.write(script_tag.encode('utf-8'))
+                out.write(view[insert_pos:])
         
-        # Find the position to insert the script (before the closing </body> tag)
-        insert_pos = html_content.rfind('</body>')
-        if insert_pos == -1:
-            logger.error("Could not find </body> tag in HTML file.")
-            return False
-        
-        # Create a script tag with the JS content
-        script_tag = f'\n<script>\n// Fixed joystick handlers\n{js_content}\n</script>\n'
-        
-        # Insert the script
-        new_html_content = html_content[:insert_pos] + script_tag + html_content[insert_pos:]
-        
-        # Create a backup of the original file
-        backup_file = html_file + '.backup'
-        if not os.path.exists(backup_file):
-            shutil.copy2(html_file, backup_file)
-            logger.info(f"Created backup of HTML file at {backup_file}")
-        
-        # Write the modified HTML
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(new_html_content)
+        # Swap the new file in once the mapping of the original is closed
+        os.replace(tmp_file, html_file)
         
         logger.info("Successfully injected JS fix into HTML file.")
         return True
@@ -78,7 +95,8 @@ def inject_js_fix(html_file, js_file):
 def start_server():
     """Start the Lockbox WebSocket server."""
     root_dir = get_project_root()
-    server_script = os.path.join(root_dir, "server", "ws_server.py")
+    server_dir = os.path.join(root_dir, "server")
+    server_script = os.path.join(server_dir, "ws_server.py")
     
     if not os.path.exists(server_script):
         logger.error(f"Server script not found at {server_script}")
@@ -86,25 +104,21 @@ def start_server():
     
     try:
         logger.info("Starting WebSocket server...")
-        process = subprocess.Popen([sys.executable, server_script])
         
-        # Wait for the server to start
-        time.sleep(2)
+        # Run the server in this interpreter instead of spawning a second one
+        sys.path.insert(0, server_dir)
+        import ws_server
         
-        # Open the webpage
+        # Open the webpage once the server listens
         url = "http://localhost:8765"
-        logger.info(f"Opening browser at {url}")
-        webbrowser.open(url)
+        threading.Thread(target=open_browser_when_ready, args=(url,), daemon=True).start()
         
-        logger.info("Server started successfully. Press Ctrl+C to stop.")
+        logger.info("Server starting. Press Ctrl+C to stop.")
         
-        # Keep the process running
-        process.wait()
+        # Blocks until the server stops; this script's own arguments are not for ws_server
+        ws_server.run([])
         
     except KeyboardInterrupt:
-        logger.info("Stopping server...")
-        process.terminate()
-        process.wait()
         logger.info("Server stopped.")
     
     except Exception as e:
@@ -115,6 +129,7 @@ def start_server():
 
 def main():
     """Main function to start the Lockbox server with all fixes applied."""
+    configure_logging()
     root_dir = get_project_root()
     
     logger.info("Starting Lockbox Server with all fixes applied...")
@@ -7,39 +7,181 @@ It reads joystick positions and controls LED intensity.
 """
 
 import os
+import re
+import errno
 import time
 import json
+import array
+import struct
+import selectors
+import socket
+import asyncio
 import serial
 import serial.tools.list_ports
 import threading
 import logging
+import logging.handlers
+import queue
+import atexit
 from colorama import Fore, Style, init
 
+try:
+    import numpy as np  # Optional: zero-copy joystick views
+except ImportError:
+    np = None
+
 # Initialize colorama for colored terminal output
 init()
 
-# Configure logging
+# Color prefixes for the connection messages, looked up once
+_GREEN = Fore.GREEN
+_YELLOW = Fore.YELLOW
+_RED = Fore.RED
+_RESET = Style.RESET_ALL
+
+# Configure logging (set LOCKBOX_DEBUG=1 for the per-frame debug logs).
+# Records are formatted and queued by the calling thread; a listener thread
+# does the file and console writes so the serial thread never blocks on them.
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler("lockbox_controller.log"),
+    logging.StreamHandler()
+)
 logging.basicConfig(
-    level=logging.DEBUG,  # Changed from INFO to DEBUG for more detailed logs
+    level=logging.DEBUG if os.environ.get("LOCKBOX_DEBUG") else logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler("lockbox_controller.log"),
-        logging.StreamHandler()
+        logging.handlers.QueueHandler(_log_queue)
     ]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flush the queued records on exit
 
 logger = logging.getLogger("LockboxController")
 
+# Longest frame the Arduino may send, e.g. <J1023,1023,1023,1023,1023,1023>
+MAX_FRAME_LENGTH = 64
+
+# Names of the values stored, in order, in LockboxController.joystick_values
+JOYSTICK_KEYS = (
+    "joystick1",
+    "joystick2",
+    "joystick3",
+    "joystick1X",
+    "joystick1Y",
+    "joystick2X",
+    "joystick2Y",
+    "joystick3X",
+    "joystick3Y"
+)
+
+# ASCII joystick frame: <JJ1X,J1Y,J2X,J2Y,J3X,J3Y>
+_JOY_RE = re.compile(rb'<J(\d+),(\d+),(\d+),(\d+),(\d+),(\d+)>')
+
+# Binary joystick frame: '<' + J1X,J1Y,J2X,J2Y,J3X,J3Y as uint16 little-endian + '>'
+_JOY_STRUCT = struct.Struct('<6H')
+BINARY_FRAME_LENGTH = _JOY_STRUCT.size + 2
+
+# Most binary frames located by one call to the compiled scanner
+MAX_FRAMES_PER_SCAN = 256
+
+def _scan_binary_frames_py(buf, starts):
+    """Locate binary frames in buf and store their offsets in starts.
+    
+    Compiled with numba by _load_binary_scanner().
+    
+    Returns:
+        Tuple (number of frames found, number of bytes consumed)
+    """
+    n = buf.shape[0]
+    count = 0
+    pos = 0
+    while pos < n and count < starts.shape[0]:
+        if buf[pos] != 60:  # '<'
+            pos += 1
+            continue
+        end = pos + BINARY_FRAME_LENGTH - 1
+        if end >= n:
+            break  # Keep the partial frame
+        if buf[end] != 62:  # '>'
+            pos += 1
+            continue
+        starts[count] = pos
+        count += 1
+        pos = end + 1
+    return count, pos
+
+# Compiled scanner shared by the controllers, None until first needed
+_scan_binary_frames = None
+
+def _load_binary_scanner():
+    """Compile the binary frame scanner, only for controllers using that protocol.
+    
+    numba is imported here rather than with the module, since the ASCII
+    protocol (the default) never needs it.
+    
+    Returns:
+        The compiled scanner, or None without numpy or numba
+    """
+    global _scan_binary_frames
+    if _scan_binary_frames is None and np is not None:
+        try:
+            from numba import njit
+        except ImportError:
+            return None
+        _scan_binary_frames = njit(cache=True)(_scan_binary_frames_py)
+    return _scan_binary_frames
+
+# Serial ports listed by find_arduino_port, reused for PORTS_CACHE_TTL seconds
+# so reconnect loops do not rescan the system ports each time
+PORTS_CACHE_TTL = 1.0
+_PORTS_CACHE = {"ts": 0.0, "ports": []}
+
+# Longest the communication thread waits for data before checking self.running
+WAIT_INTERVAL = 0.5
+
+# ADC noise tolerated on every axis before a frame counts as a new position
+JOYSTICK_DEADBAND = 1
+
+# First delay between reconnection attempts, doubled after each failure
+RECONNECT_BACKOFF_MIN = 0.2
+
+# Names of the values stored, in order, in LockboxController.led_values
+LED_KEYS = ("led1", "led2", "led3")
+
+# Frame printed by the sketch at the start of setup(), once it can receive commands
+READY_FRAME = b"<READY>"
+
+# Longest wait for READY_FRAME after a reset (older sketches never send it)
+READY_TIMEOUT = 2.0
+
+# Driver buffer size requested for both directions (honoured on Windows only)
+SERIAL_BUFFER_SIZE = 16384
+
+# Longest a serial write may block before failing, so a stalled port cannot hang the loop
+SERIAL_WRITE_TIMEOUT = 0.1
+
+# LED command sent to the Arduino: <Lled1,led2,led3>
+_LED_COMMAND = b"<L%d,%d,%d>"
+
+def _clamp8(value):
+    """Convert a value to int and clamp it to the 0-255 PWM range."""
+    value = int(value)
+    return 0 if value < 0 else (255 if value > 255 else value)
+
 class LockboxController:
     """Controller for the lockbox hardware."""
     
-    def __init__(self, baud_rate=9600, port=None, auto_reconnect=True):
+    def __init__(self, baud_rate=9600, port=None, auto_reconnect=True, binary_protocol=False):
         """Initialize the lockbox controller.
         
         Args:
             baud_rate: Serial communication baud rate
             port: COM port for Arduino (auto-detected if None)
             auto_reconnect: Automatically try to reconnect if connection is lost
+            binary_protocol: Expect fixed-size binary joystick frames instead of
+                ASCII ones (the sketch must be built with BINARY_PROTOCOL set)
         """
         self.baud_rate = baud_rate
         self.port = port
@@ -47,52 +189,74 @@ class LockboxController:
         self.connected = False
         self.running = False
         self.auto_reconnect = auto_reconnect
-        self.reconnect_delay = 5  # seconds
-          # Data from joysticks
-        self.joystick_values = {
-            "joystick1": 512,
-            "joystick2": 512,
-            "joystick3": 512,
-            "joystick1X": 512,  # Added X and Y coordinates for direct use
-            "joystick1Y": 512,
-            "joystick2X": 512,
-            "joystick2Y": 512,
-            "joystick3X": 512,
-            "joystick3Y": 512
-        }
+        self.reconnect_delay = 5  # seconds, longest delay between reconnection attempts
+        self._reconnect_backoff = RECONNECT_BACKOFF_MIN
+        self._binary_protocol = binary_protocol
         
-        # LED intensity values
-        self.led_values = {
-            "led1": 0,
-            "led2": 0,
-            "led3": 0
-        }
+        # Data from joysticks, indexed like JOYSTICK_KEYS. A fixed-size array
+        # is updated in place for every frame instead of rehashing a dict.
+        self.joystick_values = array.array('H', [512] * len(JOYSTICK_KEYS))
         
-        # Last time we got data from Arduino
-        self.last_data_time = 0
+        # Last raw joystick frame (J1X,J1Y,J2X,J2Y,J3X,J3Y), to skip unchanged ones
+        self._prev_joy = None
+        
+        # LED intensity values, indexed like LED_KEYS
+        self.led_values = array.array('h', [0] * len(LED_KEYS))
+        
+        # Last time we got data from Arduino, from time.monotonic() so that
+        # wall-clock adjustments cannot trigger or hide a data timeout
+        self._last_data_monotonic = 0
         self.data_timeout = 5  # seconds
         
+        # Bytes received from Arduino that do not form a complete frame yet
+        self._rx_buf = bytearray()
+        
+        # Compiled binary scanner and the frame offsets it fills, when available
+        self._scan_frames = _load_binary_scanner() if binary_protocol else None
+        if self._scan_frames is not None:
+            self._frame_starts = np.empty(MAX_FRAMES_PER_SCAN, dtype=np.intp)
+        
+        # LED values last written to the Arduino, to skip redundant commands
+        self._last_led_sent = None
+        
+        # Set when LED values changed while the communication thread runs; the
+        # thread then writes only the latest values once per loop iteration
+        self._led_dirty_event = threading.Event()
+        
+        # Socket written by set_led_values to wake the thread's select() (POSIX)
+        self._led_wakeup = None
+        
         # Callbacks for events
         self.joystick_callback = None
         self.connection_status_callback = None
         
+        # Event loop running coroutine callbacks, set when started from asyncio
+        self._loop = None
+        
     def find_arduino_port(self):
         """Automatically detect the Arduino COM port."""
-        logger.info(f"{Fore.YELLOW}Searching for Arduino device...{Style.RESET_ALL}")
-        ports = list(serial.tools.list_ports.comports())
+        logger.info("%sSearching for Arduino device...%s", _YELLOW, _RESET)
+        now = time.monotonic()
+        if now - _PORTS_CACHE["ts"] < PORTS_CACHE_TTL:
+            ports = _PORTS_CACHE["ports"]
+        else:
+            ports = list(serial.tools.list_ports.comports())
+            _PORTS_CACHE["ts"] = now
+            _PORTS_CACHE["ports"] = ports
         
         for port in ports:
             # Look for typical Arduino identifiers in the description
-            if 'arduino' in port.description.lower() or 'uno' in port.description.lower():
-                logger.info(f"{Fore.GREEN}Found Arduino on port {port.device}{Style.RESET_ALL}")
+            desc = port.description.lower()
+            if 'arduino' in desc or 'uno' in desc:
+                logger.info("%sFound Arduino on port %s%s", _GREEN, port.device, _RESET)
                 return port.device
         
         # If not found by description, try the first available port
         if ports:
-            logger.warning(f"{Fore.YELLOW}Arduino not specifically detected. Using first available port: {ports[0].device}{Style.RESET_ALL}")
+            logger.warning("%sArduino not specifically detected. Using first available port: %s%s", _YELLOW, ports[0].device, _RESET)
             return ports[0].device
             
-        logger.error(f"{Fore.RED}No serial ports found. Is the Arduino connected?{Style.RESET_ALL}")
+        logger.error("%sNo serial ports found. Is the Arduino connected?%s", _RED, _RESET)
         return None
     
     def connect(self):
@@ -105,30 +269,98 @@ class LockboxController:
             self.port = self.find_arduino_port()
             
         if self.port is None:
-            logger.error(f"{Fore.RED}Failed to find Arduino port{Style.RESET_ALL}")
+            logger.error("%sFailed to find Arduino port%s", _RED, _RESET)
             self._notify_connection_status(False)
             return False
             
         try:
-            self.serial_connection = serial.Serial(self.port, self.baud_rate, timeout=1)
-            time.sleep(2)  # Wait for Arduino to reset after connection
+            # Open with DTR released, then assert it to reset the Arduino
+            self.serial_connection = serial.Serial(baudrate=self.baud_rate, timeout=READY_TIMEOUT,
+                                                   write_timeout=SERIAL_WRITE_TIMEOUT, dsrdtr=False)
+            self.serial_connection.port = self.port
+            self.serial_connection.dtr = False
+            self.serial_connection.open()
+            self._set_low_latency()
+            self._set_buffer_size()
+            self.serial_connection.reset_input_buffer()
+            self._assert_dtr()
+            
+            # Wait for the sketch to announce itself instead of a fixed 2 s sleep
+            if not self.serial_connection.read_until(READY_FRAME).endswith(READY_FRAME):
+                logger.warning("No %s from Arduino after %s seconds", READY_FRAME.decode('ascii'), READY_TIMEOUT)
+            
+            # Short read timeout so the communication loop notices stop() quickly
+            self.serial_connection.timeout = 0.1
+            self._rx_buf.clear()
+            self._prev_joy = None
+            self._last_led_sent = None  # The Arduino reset its LEDs
+            _PORTS_CACHE["ts"] = 0.0  # Rescan ports after the next hardware change
             self.connected = True
-            self.last_data_time = time.time()
-            logger.info(f"{Fore.GREEN}Connected to Arduino on {self.port}{Style.RESET_ALL}")
+            self._last_data_monotonic = time.monotonic()
+            logger.info("%sConnected to Arduino on %s%s", _GREEN, self.port, _RESET)
             self._notify_connection_status(True)
             return True
-        except serial.SerialException as e:
-            logger.error(f"{Fore.RED}Failed to connect to Arduino: {e}{Style.RESET_ALL}")
+        except (serial.SerialException, OSError) as e:
+            logger.error("%sFailed to connect to Arduino: %s%s", _RED, e, _RESET)
+            # Do not leak the port opened above
+            try:
+                self.serial_connection.close()
+            except Exception:
+                pass
             self._notify_connection_status(False)
             return False
     
+    def _assert_dtr(self):
+        """Assert DTR to reset the Arduino.
+        
+        Ports without modem-control lines (ptys, socat, some virtual or
+        Bluetooth COM ports) reject the ioctl once open; the board is then
+        not reset and connect() just waits for READY_FRAME.
+        """
+        try:
+            self.serial_connection.dtr = True
+        except OSError as e:
+            if e.errno not in (errno.ENOTTY, errno.EINVAL):
+                raise
+            logger.debug("DTR not supported on %s: %s", self.port, e)
+    
+    def _set_low_latency(self):
+        """Ask the serial driver to deliver bytes without batching them.
+        
+        USB adapters such as FTDI hold received bytes for up to 16 ms by
+        default. pyserial sets ASYNC_LOW_LATENCY (TIOCSSERIAL) on Linux only.
+        """
+        if not hasattr(self.serial_connection, 'set_low_latency_mode'):
+            logger.debug("Low latency mode not available on this platform")
+            return
+        try:
+            self.serial_connection.set_low_latency_mode(True)
+            logger.debug("Low latency mode enabled on %s", self.port)
+        except (IOError, ValueError) as e:
+            # Not every driver (e.g. the Uno's CDC ACM) supports the flag
+            logger.debug("Low latency mode not supported on %s: %s", self.port, e)
+    
+    def _set_buffer_size(self):
+        """Enlarge the driver's receive and transmit buffers.
+        
+        The default Windows buffers are 4 KiB; pyserial exposes
+        set_buffer_size() on Windows only, other platforms size them in the driver.
+        """
+        if not hasattr(self.serial_connection, 'set_buffer_size'):
+            return
+        try:
+            self.serial_connection.set_buffer_size(rx_size=SERIAL_BUFFER_SIZE, tx_size=SERIAL_BUFFER_SIZE)
+            logger.debug("Serial buffers set to %d bytes on %s", SERIAL_BUFFER_SIZE, self.port)
+        except (IOError, ValueError) as e:
+            logger.debug("Serial buffer size not supported on %s: %s", self.port, e)
+    
     def disconnect(self):
         """Disconnect from the Arduino device."""
         if self.serial_connection and self.connected:
             self.stop()
             self.serial_connection.close()
             self.connected = False
-            logger.info(f"{Fore.YELLOW}Disconnected from Arduino{Style.RESET_ALL}")
+            logger.info("%sDisconnected from Arduino%s", _YELLOW, _RESET)
             self._notify_connection_status(False)
     
     def start(self):
@@ -141,11 +373,16 @@ class LockboxController:
             if not self.connect():
                 return False
         
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass  # Started outside asyncio, only plain callbacks can be used
+        
         self.running = True
         self.comm_thread = threading.Thread(target=self._communication_loop)
         self.comm_thread.daemon = True
         self.comm_thread.start()
-        logger.info(f"{Fore.GREEN}Communication with Arduino started{Style.RESET_ALL}")
+        logger.info("%sCommunication with Arduino started%s", _GREEN, _RESET)
         return True
     
     def stop(self):
@@ -153,57 +390,205 @@ class LockboxController:
         self.running = False
         if hasattr(self, 'comm_thread') and self.comm_thread.is_alive():
             self.comm_thread.join(timeout=1.0)
-        logger.info(f"{Fore.YELLOW}Communication with Arduino stopped{Style.RESET_ALL}")
+        logger.info("%sCommunication with Arduino stopped%s", _YELLOW, _RESET)
     
     def _communication_loop(self):
         """Main loop for Arduino communication (runs in separate thread)."""
-        reconnect_attempts = 0
-        max_reconnect_attempts = 5
+        # Serial ports are selectable file descriptors on POSIX only
+        selector = selectors.DefaultSelector() if os.name == 'posix' else None
+        selected = None
+        
+        if selector is not None:
+            # A byte on this pair wakes select() as soon as LED values change,
+            # instead of after up to WAIT_INTERVAL
+            wakeup_r, wakeup_w = socket.socketpair()
+            wakeup_r.setblocking(False)
+            wakeup_w.setblocking(False)
+            selector.register(wakeup_r, selectors.EVENT_READ)
+            self._led_wakeup = wakeup_w
+        
+        # Names used on every iteration, bound once
+        now = time.monotonic
+        led_dirty_event = self._led_dirty_event
+        handle_serial_data = self._handle_serial_data
         
         while self.running:
             try:
                 # Check for data timeout
-                if time.time() - self.last_data_time > self.data_timeout and self.connected:
-                    logger.warning(f"{Fore.YELLOW}No data received from Arduino for {self.data_timeout} seconds{Style.RESET_ALL}")
+                if now() - self._last_data_monotonic > self.data_timeout and self.connected:
+                    logger.warning("No data received from Arduino for %s seconds", self.data_timeout)
                     self.connected = False
                     self._notify_connection_status(False)
                     if self.auto_reconnect:
                         self._attempt_reconnect()
                         continue
-                  # Read data from Arduino if connected
-                if self.connected and self.serial_connection.in_waiting > 0:
-                    try:
-                        line = self.serial_connection.readline().decode('utf-8').strip()
-                        if line:  # Only process non-empty lines
-                            logger.debug(f"Raw data from Arduino: {line}")
-                            self._process_arduino_message(line)
-                            self.last_data_time = time.time()
-                            reconnect_attempts = 0  # Reset reconnect counter on successful data
-                    except UnicodeDecodeError:
-                        logger.warning(f"{Fore.YELLOW}Failed to decode Arduino data, skipping{Style.RESET_ALL}")
-                    except Exception as e:
-                        logger.error(f"{Fore.RED}Error processing Arduino data: {e}{Style.RESET_ALL}")
                 
-                # Small delay to prevent CPU overload
-                time.sleep(0.01)
+                if not self.connected:
+                    if self.auto_reconnect:
+                        # Keep trying, the backoff bounds the retry rate
+                        self._attempt_reconnect()
+                    else:
+                        # Small delay to prevent CPU overload while disconnected
+                        time.sleep(0.01)
+                    continue
+                
+                # Send the LED values set since the last iteration, coalesced
+                if led_dirty_event.is_set():
+                    led_dirty_event.clear()
+                    self._send_led_values()
+                
+                if selector is not None:
+                    # (Re)register the port after a reconnect
+                    if selected is not self.serial_connection:
+                        if selected is not None:
+                            selector.unregister(selected_fd)
+                        selected_fd = self.serial_connection.fileno()
+                        selector.register(selected_fd, selectors.EVENT_READ)
+                        selected = self.serial_connection
+                    
+                    # Sleep in the kernel until data arrives, LED values change
+                    # or the data timeout is due
+                    remaining = self.data_timeout - (now() - self._last_data_monotonic)
+                    serial_ready = False
+                    for key, _ in selector.select(timeout=min(max(remaining, 0), WAIT_INTERVAL)):
+                        if key.fileobj is wakeup_r:
+                            try:
+                                wakeup_r.recv(64)
+                            except BlockingIOError:
+                                pass
+                        else:
+                            serial_ready = True
+                    if not serial_ready:
+                        continue
+                    
+                    # Drain everything the driver has buffered in one call
+                    data = self.serial_connection.read(self.serial_connection.in_waiting or 1)
+                    if not data:
+                        continue
+                else:
+                    # Drain everything the driver has buffered in one call. When nothing
+                    # is pending, a blocking 1-byte read (bounded by the port timeout)
+                    # waits for the next byte instead of polling, then whatever arrived
+                    # with it is drained too so the frame is handled in one pass.
+                    pending = self.serial_connection.in_waiting
+                    if pending:
+                        data = self.serial_connection.read(pending)
+                    else:
+                        data = self.serial_connection.read(1)
+                        if not data:
+                            continue
+                        pending = self.serial_connection.in_waiting
+                        if pending:
+                            data += self.serial_connection.read(pending)
+                
+                handle_serial_data(data)
                 
             except serial.SerialException as e:
-                logger.error(f"{Fore.RED}Serial communication error: {e}{Style.RESET_ALL}")
+                logger.error("Serial communication error: %s", e)
                 self.connected = False
                 self._notify_connection_status(False)
                 
-                if self.auto_reconnect and reconnect_attempts < max_reconnect_attempts:
-                    reconnect_attempts += 1
+                if self.auto_reconnect:
                     self._attempt_reconnect()
                 else:
                     break
                     
             except Exception as e:
-                logger.error(f"{Fore.RED}Unexpected error in communication loop: {e}{Style.RESET_ALL}")
+                logger.error("Unexpected error in communication loop: %s", e)
+        
+        if selector is not None:
+            self._led_wakeup = None
+            selector.close()
+            wakeup_r.close()
+            wakeup_w.close()
+    
+    def _handle_serial_data(self, data):
+        """Buffer bytes received from Arduino and process the complete frames.
+        
+        Args:
+            data: Bytes read from the serial port
+        """
+        self._rx_buf += data
+        self._last_data_monotonic = time.monotonic()
+        
+        debug = logger.isEnabledFor(logging.DEBUG)
+        process_message = self._process_arduino_message
+        for frame in self._extract_frames():
+            try:
+                if debug:
+                    logger.debug("Raw data from Arduino: %s", frame)
+                process_message(frame)
+            except Exception as e:
+                logger.error("Error processing Arduino data: %s", e)
+    
+    def _extract_frames(self):
+        """Extract the complete <...> frames from the receive buffer.
+        
+        Bytes outside of markers (e.g. line endings or the startup banner) are
+        dropped, and a trailing incomplete frame is kept for the next read.
+        
+        Returns:
+            List of frames as bytearray slices, markers included
+        """
+        buf = self._rx_buf
+        find = buf.find
+        frames = []
+        pos = 0
+        
+        if self._scan_frames is not None:
+            # The numpy view must be released before the buffer is resized
+            count, pos = self._scan_frames(np.frombuffer(buf, dtype=np.uint8), self._frame_starts)
+            for start in self._frame_starts[:count]:
+                frames.append(buf[start:start + BINARY_FRAME_LENGTH])
+            del buf[:pos]
+            return frames
+        
+        if self._binary_protocol:
+            # Payload bytes may equal the markers, so frames are fixed-length
+            # and the end marker is checked at its expected offset.
+            while True:
+                start = find(b'<', pos)
+                if start == -1:
+                    pos = len(buf)
+                    break
+                end = start + BINARY_FRAME_LENGTH - 1
+                if end >= len(buf):
+                    pos = start
+                    break
+                if buf[end] != 0x3E:  # '>'
+                    # Not aligned on a frame, resync on the next start marker
+                    pos = start + 1
+                    continue
+                frames.append(buf[start:end + 1])
+                pos = end + 1
+            
+            del buf[:pos]
+            return frames
+        
+        while True:
+            start = find(b'<', pos)
+            if start == -1:
+                pos = len(buf)
+                break
+            end = find(b'>', start)
+            if end == -1:
+                # Keep the partial frame, unless it is too long to be valid
+                pos = start if len(buf) - start <= MAX_FRAME_LENGTH else len(buf)
+                break
+            frames.append(buf[start:end + 1])
+            pos = end + 1
+        
+        del buf[:pos]
+        return frames
     
     def _attempt_reconnect(self):
-        """Attempt to reconnect to the Arduino."""
-        logger.info(f"{Fore.YELLOW}Attempting to reconnect to Arduino...{Style.RESET_ALL}")
+        """Attempt to reconnect to the Arduino.
+        
+        The delay before the attempt starts at RECONNECT_BACKOFF_MIN and doubles
+        after each failure, up to reconnect_delay, so a brief unplug recovers
+        quickly while a missing device is not hammered.
+        """
+        logger.info("%sAttempting to reconnect to Arduino...%s", _YELLOW, _RESET)
         
         # Close the current connection if it exists
         if self.serial_connection:
@@ -212,66 +597,111 @@ class LockboxController:
             except:
                 pass
             
-        time.sleep(self.reconnect_delay)
+        time.sleep(self._reconnect_backoff)
         
         # Try to connect again
         try:
-            self.connect()
+            connected = self.connect()
         except Exception as e:
-            logger.error(f"{Fore.RED}Reconnection attempt failed: {e}{Style.RESET_ALL}")
+            logger.error("%sReconnection attempt failed: %s%s", _RED, e, _RESET)
+            connected = False
+        
+        if connected:
+            self._reconnect_backoff = RECONNECT_BACKOFF_MIN
+        else:
+            self._reconnect_backoff = min(self._reconnect_backoff * 2, self.reconnect_delay)
     
     def _process_arduino_message(self, message):
         """Process incoming messages from Arduino.
         
+        The protocol is ASCII, so frames are parsed as bytes without decoding.
+        
         Args:
-            message: String message from Arduino
+            message: Frame from Arduino as bytes or bytearray, markers included
         """
         if not message:
             return
+        
+        if self._binary_protocol:
+            self._process_binary_frame(message)
+            return
             
-        # Check for start and end markers
-        if message.startswith('<') and message.endswith('>'):
-            # Extract content between markers
-            content = message[1:-1]            # Handle joystick data (format: J1X,J1Y,J2X,J2Y,J3X,J3Y)
-            if content.startswith('J'):
-                try:
-                    # Parse joystick values
-                    values = content[1:].split(',')
-                    if len(values) == 6:
-                        # Arduino sends X and Y for each joystick
-                        j1x = int(values[0])
-                        j1y = int(values[1])
-                        j2x = int(values[2])
-                        j2y = int(values[3])
-                        j3x = int(values[4])
-                        j3y = int(values[5])
-                        
-                        # Calculate average or use X value as primary
-                        # For this implementation, we're using X values
-                        self.joystick_values["joystick1"] = j1x
-                        self.joystick_values["joystick2"] = j2x
-                        self.joystick_values["joystick3"] = j3x
-                        
-                        # Store X,Y pairs if needed
-                        self.joystick_values["joystick1X"] = j1x
-                        self.joystick_values["joystick1Y"] = j1y
-                        self.joystick_values["joystick2X"] = j2x
-                        self.joystick_values["joystick2Y"] = j2y
-                        self.joystick_values["joystick3X"] = j3x
-                        self.joystick_values["joystick3Y"] = j3y
-                        
-                        # Additional debug info
-                        logger.debug(f"Raw joystick data - J1: ({j1x},{j1y}), J2: ({j2x},{j2y}), J3: ({j3x},{j3y})")
-                        
-                        # Call the callback with new joystick data
-                        if self.joystick_callback:
-                            self.joystick_callback(self.joystick_values)
-                            
-                        logger.debug(f"Joystick values: {self.joystick_values}")
-                    else:
-                        logger.warning(f"{Fore.YELLOW}Unexpected joystick data format: {content}, found {len(values)} values{Style.RESET_ALL}")
-                except Exception as e:
-                    logger.error(f"{Fore.RED}Error parsing joystick data: {e}{Style.RESET_ALL}")
+        # Handle joystick data (format: <JJ1X,J1Y,J2X,J2Y,J3X,J3Y>)
+        match = _JOY_RE.fullmatch(message)
+        if match is None:
+            if message[:2] == b'<J':
+                content = message[1:-1].decode('ascii', errors='replace')
+                logger.warning("Unexpected joystick data format: %s", content)
+            return
+        
+        try:
+            # Arduino sends X and Y for each joystick (int() accepts ASCII bytes)
+            j1x, j1y, j2x, j2y, j3x, j3y = match.groups()
+            frame_values = (int(j1x), int(j1y), int(j2x), int(j2y), int(j3x), int(j3y))
+            
+            # Joysticks at rest repeat the same frame, nothing to update
+            if self._is_same_position(frame_values):
+                return
+            
+            # Additional debug info
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("Raw joystick data - J1: (%s,%s), J2: (%s,%s), J3: (%s,%s)", *frame_values)
+            
+            self._update_joystick_values(frame_values)
+            if debug:
+                logger.debug("Joystick values: %s", self.joystick_values.tolist())
+        except Exception as e:
+            logger.error("Error parsing joystick data: %s", e)
+    
+    def _process_binary_frame(self, frame):
+        """Process a binary joystick frame from Arduino.
+        
+        Args:
+            frame: BINARY_FRAME_LENGTH bytes, markers included
+        """
+        if len(frame) != BINARY_FRAME_LENGTH:
+            logger.warning("Unexpected binary frame length: %d", len(frame))
+            return
+        
+        frame_values = _JOY_STRUCT.unpack_from(frame, 1)
+        if not self._is_same_position(frame_values):
+            self._update_joystick_values(frame_values)
+    
+    def _is_same_position(self, frame_values):
+        """Check if a frame only differs from the last stored one by ADC noise.
+        
+        Args:
+            frame_values: Tuple (J1X, J1Y, J2X, J2Y, J3X, J3Y) from Arduino
+        """
+        prev = self._prev_joy
+        if prev is None:
+            return False
+        if frame_values == prev:
+            return True
+        for new, old in zip(frame_values, prev):
+            if new - old > JOYSTICK_DEADBAND or old - new > JOYSTICK_DEADBAND:
+                return False
+        return True
+    
+    def _update_joystick_values(self, frame_values):
+        """Store a new joystick frame and notify the joystick callback.
+        
+        Args:
+            frame_values: Tuple (J1X, J1Y, J2X, J2Y, J3X, J3Y) from Arduino
+        """
+        self._prev_joy = frame_values
+        
+        # Use X values as primary joystick values, followed by the X,Y pairs
+        joystick_values = self.joystick_values
+        joystick_values[0] = frame_values[0]
+        joystick_values[1] = frame_values[2]
+        joystick_values[2] = frame_values[4]
+        joystick_values[3:] = array.array('H', frame_values)
+        
+        # Call the callback with new joystick data
+        if self.joystick_callback:
+            self._call_callback(self.joystick_callback, self.get_joystick_values())
     
     def set_led_values(self, led1=None, led2=None, led3=None):
         """Set LED intensity values (0-255) and send to Arduino.
@@ -281,26 +711,57 @@ class LockboxController:
             led2: Intensity for LED 2 (0-255)
             led3: Intensity for LED 3 (0-255)
             
+        While the communication thread runs, the command is left to it so that
+        rapid updates (e.g. slider drags) result in one write per loop iteration.
+            
         Returns:
-            bool: True if command sent successfully, False otherwise
+            bool: True if command sent or queued successfully, False otherwise
         """
+        # Validate every provided value before storing any of them, so that a
+        # bad value (TypeError/ValueError) leaves the LEDs unchanged
+        new_values = [None if value is None else _clamp8(value) for value in (led1, led2, led3)]
+        
         # Update only the values that are provided
-        if led1 is not None:
-            self.led_values["led1"] = max(0, min(255, led1))
-        if led2 is not None:
-            self.led_values["led2"] = max(0, min(255, led2))
-        if led3 is not None:
-            self.led_values["led3"] = max(0, min(255, led3))
+        for index, value in enumerate(new_values):
+            if value is not None:
+                self.led_values[index] = value
         
+        comm_thread = getattr(self, 'comm_thread', None)
+        if self.running and self.connected and comm_thread is not None and comm_thread.is_alive():
+            # Already set: the thread has not sent the previous values yet and
+            # will pick these up with them
+            if not self._led_dirty_event.is_set():
+                self._led_dirty_event.set()
+                wakeup = self._led_wakeup
+                if wakeup is not None:
+                    try:
+                        wakeup.send(b'\0')
+                    except OSError:
+                        pass  # Closed by a stopping thread, or a wakeup is already queued
+            return True
+        
+        return self._send_led_values()
+    
+    def _send_led_values(self):
+        """Send the current LED values to Arduino unless it already shows them.
+        
+        Returns:
+            bool: True if command sent successfully, False otherwise
+        """
         # Send to Arduino if connected
         if self.connected and self.serial_connection:
+            led_state = tuple(self.led_values)
+            if led_state == self._last_led_sent:
+                # The Arduino already shows these values
+                return True
             try:
-                command = f"<L{self.led_values['led1']},{self.led_values['led2']},{self.led_values['led3']}>"
-                self.serial_connection.write(command.encode('utf-8'))
-                logger.debug(f"Sent LED command: {command}")
+                command = _LED_COMMAND % led_state
+                self.serial_connection.write(command)
+                self._last_led_sent = led_state
+                logger.debug("Sent LED command: %s", command)
                 return True
             except Exception as e:
-                logger.error(f"{Fore.RED}Error sending LED command: {e}{Style.RESET_ALL}")
+                logger.error("Error sending LED command: %s", e)
                 return False
         return False
     
@@ -313,6 +774,13 @@ class LockboxController:
         """
         self.joystick_callback = callback
     
+    def unregister_joystick_callback(self):
+        """Remove the joystick update callback.
+        
+        Joystick values keep being read and stored, only the dispatch stops.
+        """
+        self.joystick_callback = None
+    
     def register_connection_status_callback(self, callback):
         """Register a callback for connection status changes.
         
@@ -329,7 +797,27 @@ class LockboxController:
             status: Boolean connection status (True=connected, False=disconnected)
         """
         if self.connection_status_callback:
-            self.connection_status_callback(status)
+            self._call_callback(self.connection_status_callback, status)
+    
+    def _call_callback(self, callback, *args):
+        """Call an event callback, on the controller's event loop when there is one.
+        
+        Args:
+            callback: Plain function or coroutine function
+            *args: Arguments for the callback
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            if asyncio.iscoroutinefunction(callback):
+                logger.warning("No event loop to run coroutine callback %s", callback.__name__)
+            else:
+                callback(*args)
+        elif asyncio.iscoroutinefunction(callback):
+            # Safe from both the communication thread and the loop thread
+            asyncio.run_coroutine_threadsafe(callback(*args), loop)
+        else:
+            # Run the consumer on the event loop, not in the communication thread
+            loop.call_soon_threadsafe(callback, *args)
     
     def get_joystick_values(self):
         """Get the current joystick values.
@@ -337,7 +825,36 @@ class LockboxController:
         Returns:
             Dict containing joystick values
         """
-        return self.joystick_values.copy()
+        return dict(zip(JOYSTICK_KEYS, self.joystick_values))
+    
+    def get_joystick_tuple(self):
+        """Get the current joystick values without building a dict.
+        
+        Returns:
+            Tuple of joystick values, ordered like JOYSTICK_KEYS
+        """
+        return tuple(self.joystick_values)
+    
+    @property
+    def joystick_memoryview(self):
+        """Live, zero-copy view of joystick_values, ordered like JOYSTICK_KEYS.
+        
+        The view follows every update; take bytes(view) or view.tolist() for a
+        stable reading.
+        """
+        return memoryview(self.joystick_values)
+    
+    def joystick_numpy(self):
+        """Get a live, zero-copy uint16 numpy view of joystick_values.
+        
+        Like joystick_memoryview, the view follows every update.
+        
+        Returns:
+            numpy.ndarray ordered like JOYSTICK_KEYS, or None without numpy
+        """
+        if np is None:
+            return None
+        return np.frombuffer(self.joystick_values, dtype=np.uint16)
     
     def get_led_values(self):
         """Get the current LED values.
@@ -345,7 +862,15 @@ class LockboxController:
         Returns:
             Dict containing LED values
         """
-        return self.led_values.copy()
+        return dict(zip(LED_KEYS, self.led_values))
+    
+    def get_led_tuple(self):
+        """Get the current LED values without building a dict.
+        
+        Returns:
+            Tuple of LED values, ordered like LED_KEYS
+        """
+        return tuple(self.led_values)
     
     def get_connection_status(self):
         """Get the current connection status.
@@ -361,31 +886,28 @@ class LockboxController:
         Returns:
             dict: Diagnostic results
         """
+        data_age = time.monotonic() - self._last_data_monotonic if self._last_data_monotonic > 0 else None
         results = {
             "connected": self.connected,
             "port": self.port,
             "baud_rate": self.baud_rate,
             "joysticks": self.get_joystick_values(),
             "leds": self.get_led_values(),
-            "last_data_time": self.last_data_time,
-            "data_age": time.time() - self.last_data_time if self.last_data_time > 0 else None
+            "last_data_time": time.time() - data_age if data_age is not None else None,
+            "data_age": data_age
         }
         
         # Test LED control if connected
         if self.connected:
-            # Save current LED values
-            saved_leds = self.get_led_values()
+            # Save current LED values (a tuple, the array is updated in place)
+            saved_leds = self.get_led_tuple()
             
             # Test setting LEDs to 50% brightness
             led_test_success = self.set_led_values(128, 128, 128)
             results["led_test"] = led_test_success
             
             # Restore original values
-            self.set_led_values(
-                saved_leds["led1"], 
-                saved_leds["led2"], 
-                saved_leds["led3"]
-            )
+            self.set_led_values(*saved_leds)
         else:
             results["led_test"] = False
             
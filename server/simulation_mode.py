@@ -6,15 +6,29 @@ This module provides a simulation mode for the Lockbox server when Arduino hardw
 It simulates joystick movements and LED control without requiring actual hardware.
 """
 
+import array
+import asyncio
 import random
 import time
 import threading
 import logging
 from colorama import Fore, Style, init
 
+try:
+    import numpy as np  # Optional: vectorized joystick drift
+except ImportError:
+    np = None
+
 # Initialize colorama for colored terminal output
 init()
 
+# Color prefixes for the log messages, passed as lazy %s arguments
+_GREEN = Fore.GREEN
+_YELLOW = Fore.YELLOW
+_RED = Fore.RED
+_CYAN = Fore.CYAN
+_RESET = Style.RESET_ALL
+
 # Configure logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -27,6 +41,69 @@ logging.basicConfig(
 
 logger = logging.getLogger("LockboxSimulator")
 
+# Names of the values stored, in order, in LockboxSimulator.joystick_values
+# (same layout as LockboxController.joystick_values)
+JOYSTICK_KEYS = (
+    "joystick1",
+    "joystick2",
+    "joystick3",
+    "joystick1X",
+    "joystick1Y",
+    "joystick2X",
+    "joystick2Y",
+    "joystick3X",
+    "joystick3Y"
+)
+
+# LED names, indexed by LED number - 1
+LED_KEYS = ("led1", "led2", "led3")
+
+# Largest change of a simulated joystick value per tick
+MAX_DRIFT = 20
+
+# Seconds between two simulated joystick updates
+SIMULATION_INTERVAL = 0.1
+
+# Pause after an error in the simulation loop, doubled on each consecutive error
+ERROR_RETRY_DELAY = 1.0
+ERROR_RETRY_DELAY_MAX = 30.0
+
+def _drift_clip_py(values, max_drift):
+    """Drift every value by up to max_drift and clip it to 0-1023, in place."""
+    for i in range(values.shape[0]):
+        value = np.int64(values[i]) + np.random.randint(-max_drift, max_drift + 1)
+        values[i] = 0 if value < 0 else (1023 if value > 1023 else value)
+
+# _drift_clip_py compiled by numba, set by _compile_drift_clip() once ready
+_drift_clip = None
+_drift_clip_tried = False
+
+def _compile_drift_clip():
+    """Import numba (optional) and compile the joystick drift.
+    
+    The import and the JIT compilation take seconds: this runs in an
+    executor or in the simulation thread, never on the event loop. The
+    numpy drift is used until _drift_clip is set.
+    """
+    global _drift_clip, _drift_clip_tried
+    if _drift_clip_tried or np is None:
+        return
+    _drift_clip_tried = True
+    
+    try:
+        from numba import njit
+    except ImportError:
+        return
+    
+    try:
+        compiled = njit(cache=True)(_drift_clip_py)
+        # Compile for the uint16 joystick array now rather than on the first tick
+        compiled(np.full(1, 512, dtype=np.uint16), 0)
+    except Exception as e:
+        logger.warning("%sCompilation numba impossible, dérive numpy utilisée: %s%s", _YELLOW, e, _RESET)
+        return
+    _drift_clip = compiled
+
 class LockboxSimulator:
     """Simulator for the lockbox hardware."""
     
@@ -40,40 +117,37 @@ class LockboxSimulator:
         self.running = False
         self.auto_reconnect = auto_reconnect
         
-        # Data from joysticks
-        self.joystick_values = {
-            "joystick1": 512,
-            "joystick2": 512,
-            "joystick3": 512,
-            "joystick1X": 512,
-            "joystick1Y": 512,
-            "joystick2X": 512,
-            "joystick2Y": 512,
-            "joystick3X": 512,
-            "joystick3Y": 512
-        }
+        # Data from joysticks, indexed like JOYSTICK_KEYS
+        self.joystick_values = array.array('H', [512] * len(JOYSTICK_KEYS))
+        
+        # numpy view sharing the array's memory, to drift all values in one step
+        if np is not None:
+            self._joystick_view = np.frombuffer(self.joystick_values, dtype=np.uint16)
+            self._np_rng = np.random.default_rng()
+        
+        # Own generator for the pure Python drift: no shared module-level RNG
+        self._rng = random.Random()
+        self._randint = self._rng.randint
         
         # LED intensity values
-        self.led_values = {
-            "led1": 0,
-            "led2": 0,
-            "led3": 0
-        }
+        self.led_values = dict.fromkeys(LED_KEYS, 0)
         
-        # Last time we got data from simulation
-        self.last_data_time = time.time()
-        self.data_timeout = 5  # seconds
+        # Monotonic time until which the simulation counts as active
+        self.data_timeout = 5.0  # seconds
+        self._active_deadline = time.monotonic() + self.data_timeout
         
         # Callbacks for events
         self.joystick_callback = None
         self.connection_status_callback = None
         
-        # Thread for simulation
+        # Simulation task on the event loop, or thread when started outside asyncio
+        self._task = None
+        self._stop_event = None
         self.simulation_thread = None
         
     def connect(self):
         """Simulate connecting to the Arduino."""
-        logger.info(f"{Fore.GREEN}Simulateur Lockbox connecté{Style.RESET_ALL}")
+        logger.info("%sSimulateur Lockbox connecté%s", _GREEN, _RESET)
         self.connected = True
         if self.connection_status_callback:
             self.connection_status_callback(True)
@@ -81,86 +155,156 @@ class LockboxSimulator:
         
     def disconnect(self):
         """Simulate disconnecting from the Arduino."""
-        logger.info(f"{Fore.YELLOW}Simulateur Lockbox déconnecté{Style.RESET_ALL}")
+        logger.info("%sSimulateur Lockbox déconnecté%s", _YELLOW, _RESET)
         self.stop()
         self.connected = False
         if self.connection_status_callback:
             self.connection_status_callback(False)
             
     def start(self):
-        """Start the simulation thread."""
+        """Start the simulation.
+        
+        Runs as a task on the current event loop when called from asyncio,
+        otherwise in a thread.
+        
+        Returns:
+            bool: True, like LockboxController.start()
+        """
         if self.running:
-            return
+            return True
             
-        logger.info(f"{Fore.GREEN}Démarrage du simulateur Lockbox{Style.RESET_ALL}")
+        logger.info("%sDémarrage du simulateur Lockbox%s", _GREEN, _RESET)
         self.running = True
         
         # Connect first
         if not self.connected:
             self.connect()
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None:
+            # Compile the drift off the loop; the ticks use numpy until it is ready
+            if not _drift_clip_tried and np is not None:
+                loop.run_in_executor(None, _compile_drift_clip)
             
-        # Start the simulation thread
-        self.simulation_thread = threading.Thread(target=self._simulation_loop)
-        self.simulation_thread.daemon = True
-        self.simulation_thread.start()
+            # No thread: the event loop wakes the simulation on each tick
+            self._stop_event = asyncio.Event()
+            self._task = loop.create_task(self._simulation_loop_async())
+        else:
+            # Start the simulation thread
+            self.simulation_thread = threading.Thread(target=self._simulation_loop)
+            self.simulation_thread.daemon = True
+            self.simulation_thread.start()
+        return True
         
     def stop(self):
         """Stop the simulation thread."""
         if not self.running:
             return
             
-        logger.info(f"{Fore.YELLOW}Arrêt du simulateur Lockbox{Style.RESET_ALL}")
+        logger.info("%sArrêt du simulateur Lockbox%s", _YELLOW, _RESET)
         self.running = False
         
+        if self._stop_event is not None:
+            # Wakes the task immediately instead of after the current tick
+            self._stop_event.set()
+            self._stop_event = None
+            self._task = None
+        
         if self.simulation_thread:
             self.simulation_thread.join(timeout=1.0)
             self.simulation_thread = None
             
+    async def _simulation_loop_async(self):
+        """Simulation loop run as an asyncio task."""
+        stop_event = self._stop_event
+        error_delay = ERROR_RETRY_DELAY
+        while not stop_event.is_set():
+            # The try block wraps the whole tick loop: it is only re-entered after an error
+            try:
+                while not stop_event.is_set():
+                    # Generate random joystick values
+                    self._update_joystick_values()
+                    
+                    # Push back the activity deadline
+                    self._active_deadline = time.monotonic() + self.data_timeout
+                    
+                    # Notify callback if set (the dict is only built for it)
+                    callback = self.joystick_callback
+                    if callback:
+                        result = callback(dict(zip(JOYSTICK_KEYS, self.joystick_values)))
+                        if asyncio.iscoroutine(result):
+                            await result
+                    error_delay = ERROR_RETRY_DELAY
+                    
+                    # Wait for the next tick, or return as soon as stop() is called
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), SIMULATION_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+                
+            except Exception as e:
+                logger.error("%sErreur dans la boucle de simulation: %s%s", _RED, e, _RESET)
+                await asyncio.sleep(error_delay)
+                error_delay = min(error_delay * 2, ERROR_RETRY_DELAY_MAX)
+    
     def _simulation_loop(self):
         """Main simulation loop that generates random joystick movements."""
+        _compile_drift_clip()
+        error_delay = ERROR_RETRY_DELAY
         while self.running:
+            # The try block wraps the whole tick loop: it is only re-entered after an error
             try:
-                # Generate random joystick values
-                self._update_joystick_values()
-                
-                # Update last data time
-                self.last_data_time = time.time()
-                
-                # Notify callback if set
-                if self.joystick_callback:
-                    self.joystick_callback(self.joystick_values)
+                while self.running:
+                    # Generate random joystick values
+                    self._update_joystick_values()
                     
-                # Sleep to simulate data rate
-                time.sleep(0.1)
+                    # Push back the activity deadline
+                    self._active_deadline = time.monotonic() + self.data_timeout
+                    
+                    # Notify callback if set (the dict is only built for it)
+                    if self.joystick_callback:
+                        self.joystick_callback(dict(zip(JOYSTICK_KEYS, self.joystick_values)))
+                    error_delay = ERROR_RETRY_DELAY
+                        
+                    # Sleep to simulate data rate
+                    time.sleep(SIMULATION_INTERVAL)
                 
             except Exception as e:
-                logger.error(f"{Fore.RED}Erreur dans la boucle de simulation: {e}{Style.RESET_ALL}")
-                time.sleep(1.0)
+                logger.error("%sErreur dans la boucle de simulation: %s%s", _RED, e, _RESET)
+                time.sleep(error_delay)
+                error_delay = min(error_delay * 2, ERROR_RETRY_DELAY_MAX)
                 
     def _update_joystick_values(self):
         """Generate random joystick values."""
         # For simulation, we'll just update with random values
         # However, we'll make the changes gradual for realism
+        if _drift_clip is not None:
+            # Compiled loop over the shared memory, no temporary arrays
+            _drift_clip(self._joystick_view, MAX_DRIFT)
+            return
         
-        # Update joystick1 values (single value and X,Y)
-        self.joystick_values["joystick1"] = self._drift_value(self.joystick_values["joystick1"])
-        self.joystick_values["joystick1X"] = self._drift_value(self.joystick_values["joystick1X"])
-        self.joystick_values["joystick1Y"] = self._drift_value(self.joystick_values["joystick1Y"])
-        
-        # Update joystick2 values
-        self.joystick_values["joystick2"] = self._drift_value(self.joystick_values["joystick2"])
-        self.joystick_values["joystick2X"] = self._drift_value(self.joystick_values["joystick2X"])
-        self.joystick_values["joystick2Y"] = self._drift_value(self.joystick_values["joystick2Y"])
+        if np is not None:
+            # Stay in uint16, in place: add an offset in 0..2*MAX_DRIFT (no overflow
+            # below 1023 + 2*MAX_DRIFT), subtract MAX_DRIFT saturating at 0, clip to 1023
+            view = self._joystick_view
+            np.add(view, self._np_rng.integers(0, 2 * MAX_DRIFT + 1, size=view.shape[0], dtype=np.uint16), out=view)
+            np.maximum(view, MAX_DRIFT, out=view)
+            np.subtract(view, MAX_DRIFT, out=view)
+            np.minimum(view, 1023, out=view)
+            return
         
-        # Update joystick3 values
-        self.joystick_values["joystick3"] = self._drift_value(self.joystick_values["joystick3"])
-        self.joystick_values["joystick3X"] = self._drift_value(self.joystick_values["joystick3X"])
-        self.joystick_values["joystick3Y"] = self._drift_value(self.joystick_values["joystick3Y"])
+        values = self.joystick_values
+        for i in range(len(values)):
+            values[i] = self._drift_value(values[i])
     
-    def _drift_value(self, current_value, max_drift=20):
+    def _drift_value(self, current_value, max_drift=MAX_DRIFT):
         """Create a drift in the value for more natural movement."""
         # Randomly drift the value by a small amount
-        drift = random.randint(-max_drift, max_drift)
+        drift = self._randint(-max_drift, max_drift)
         new_value = current_value + drift
         
         # Keep within Arduino analog range (0-1023)
@@ -169,48 +313,110 @@ class LockboxSimulator:
     def set_led_value(self, led_num, value):
         """Set an LED value."""
         if 1 <= led_num <= 3:
-            led_key = f"led{led_num}"
-            self.led_values[led_key] = max(0, min(255, value))
-            logger.info(f"{Fore.CYAN}LED {led_num} définie à {value}{Style.RESET_ALL}")
+            self.led_values[LED_KEYS[led_num - 1]] = max(0, min(255, value))
+            logger.info("%sLED %s définie à %s%s", _CYAN, led_num, value, _RESET)
             return True
         return False
 
     def get_led_value(self, led_num):
         """Get an LED value."""
         if 1 <= led_num <= 3:
-            led_key = f"led{led_num}"
-            return self.led_values[led_key]
+            return self.led_values[LED_KEYS[led_num - 1]]
         return 0
         
+    def set_led_values(self, led1=None, led2=None, led3=None):
+        """Set several LED values at once, like LockboxController.
+        
+        Args:
+            led1: Value for LED 1 (0-255), None to leave it unchanged
+            led2: Value for LED 2 (0-255), None to leave it unchanged
+            led3: Value for LED 3 (0-255), None to leave it unchanged
+        
+        Returns:
+            bool: True
+        """
+        # Convert every provided value before storing any of them
+        new_values = [None if value is None else max(0, min(255, int(value))) for value in (led1, led2, led3)]
+        for key, value in zip(LED_KEYS, new_values):
+            if value is not None:
+                self.led_values[key] = value
+        logger.info("%sLEDs définies à %s%s", _CYAN, self.led_values, _RESET)
+        return True
+        
+    def get_led_values(self):
+        """Get a copy of the LED values, keyed like LED_KEYS."""
+        return dict(self.led_values)
+        
+    def get_led_tuple(self):
+        """Get the LED values as a tuple, ordered like LED_KEYS."""
+        return tuple(self.led_values.values())
+        
+    def get_joystick_values(self):
+        """Get the joystick values, keyed like JOYSTICK_KEYS."""
+        return dict(zip(JOYSTICK_KEYS, self.joystick_values))
+        
+    def get_joystick_tuple(self):
+        """Get the joystick values as a tuple, ordered like JOYSTICK_KEYS."""
+        return tuple(self.joystick_values)
+        
     def get_joystick_value(self, joystick_num):
         """Get a joystick value (0-1023)."""
         if 1 <= joystick_num <= 3:
-            joystick_key = f"joystick{joystick_num}"
-            return self.joystick_values[joystick_key]
+            return self.joystick_values[joystick_num - 1]
         return 512  # Middle position
         
     def get_joystick_position(self, joystick_num):
         """Get a joystick position as X,Y coordinates."""
         if 1 <= joystick_num <= 3:
+            # X,Y pairs follow the three primary values
+            x_index = 1 + 2 * joystick_num
             return {
-                "x": self.joystick_values[f"joystick{joystick_num}X"],
-                "y": self.joystick_values[f"joystick{joystick_num}Y"]
+                "x": self.joystick_values[x_index],
+                "y": self.joystick_values[x_index + 1]
             }
         return {"x": 512, "y": 512}  # Middle position
         
-    def set_joystick_callback(self, callback):
-        """Set a callback for joystick updates."""
+    def register_joystick_callback(self, callback):
+        """Register a callback for joystick updates, like LockboxController."""
         self.joystick_callback = callback
         
-    def set_connection_status_callback(self, callback):
-        """Set a callback for connection status changes."""
+    def unregister_joystick_callback(self):
+        """Remove the joystick update callback; the simulation keeps running."""
+        self.joystick_callback = None
+        
+    def register_connection_status_callback(self, callback):
+        """Register a callback for connection status changes, like LockboxController."""
         self.connection_status_callback = callback
         
+    # Older names kept for existing callers
+    set_joystick_callback = register_joystick_callback
+    set_connection_status_callback = register_connection_status_callback
+        
     def is_connected(self):
         """Check if the simulator is connected."""
         return self.connected
         
+    def get_connection_status(self):
+        """Check if the simulator is connected, like LockboxController."""
+        return self.connected
+        
+    def run_diagnostic(self):
+        """Report the simulated state, like LockboxController.run_diagnostic().
+        
+        Returns:
+            dict: Diagnostic results
+        """
+        return {
+            "connected": self.connected,
+            "port": None,
+            "baud_rate": None,
+            "joysticks": self.get_joystick_values(),
+            "leds": self.get_led_values(),
+            "simulated": True,
+            "led_test": self.connected
+        }
+        
     def is_active(self):
         """Check if data is being actively received."""
         # If we've received data in the last X seconds, we're active
-        return time.time() - self.last_data_time < self.data_timeout
+        return time.monotonic() < self._active_deadline
@@ -16,18 +16,24 @@ HOST = "localhost"
 PORT = 8765
 URI = f"ws://{HOST}:{PORT}"
 
+# Joystick keys, in the order of the values built for each update
+JOYSTICK_KEYS = (
+    "joystick1",
+    "joystick2",
+    "joystick3",
+    "joystick1X",
+    "joystick1Y",
+    "joystick2X",
+    "joystick2Y",
+    "joystick3X",
+    "joystick3Y"
+)
+
+# Plage des valeurs aléatoires (bornes incluses, comme randint(400, 600))
+VALUE_RANGE = range(400, 601)
+
 # Joystick values
-joystick_values = {
-    "joystick1": 512,
-    "joystick2": 512,
-    "joystick3": 512,
-    "joystick1X": 512,
-    "joystick1Y": 512,
-    "joystick2X": 512,
-    "joystick2Y": 512,
-    "joystick3X": 512,
-    "joystick3Y": 512
-}
+joystick_values = dict.fromkeys(JOYSTICK_KEYS, 512)
 
 async def simulate_joystick_movement():
     """Simulate joystick movement by changing values randomly."""
@@ -37,18 +43,11 @@ async def simulate_joystick_movement():
             
             # Simulate joystick movement
             for _ in range(30):  # Run for 30 iterations
-                # Randomly change joystick values
-                joystick_values["joystick1"] = random.randint(400, 600)
-                joystick_values["joystick2"] = random.randint(400, 600)
-                joystick_values["joystick3"] = random.randint(400, 600)
+                # Randomly change joystick values, drawn in a single call
+                j1, j2, j3, y1, y2, y3 = random.choices(VALUE_RANGE, k=6)
                 
-                # Update X and Y values
-                joystick_values["joystick1X"] = joystick_values["joystick1"]
-                joystick_values["joystick1Y"] = random.randint(400, 600)
-                joystick_values["joystick2X"] = joystick_values["joystick2"]
-                joystick_values["joystick2Y"] = random.randint(400, 600)
-                joystick_values["joystick3X"] = joystick_values["joystick3"]
-                joystick_values["joystick3Y"] = random.randint(400, 600)
+                # X values follow the main values, Y values are independent
+                joystick_values.update(zip(JOYSTICK_KEYS, (j1, j2, j3, j1, y1, j2, y2, j3, y3)))
                 
                 # Create and send message
                 message = {
@@ -15,29 +15,77 @@ import asyncio
 import websockets
 import threading
 import signal
+import socket
 import sys
 import logging
+import logging.handlers
+import queue
+import atexit
 import argparse
+import time
 import uuid
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 from functools import partial
 from colorama import Fore, Style, init
-from app_game_control import LockboxController
+from app_game_control import LockboxController, JOYSTICK_KEYS, LED_KEYS
+
+try:
+    import orjson  # Optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # Optional: faster event loop (not available on Windows)
+except ImportError:
+    uvloop = None
+
+if orjson is not None:
+    def _dumps(obj):
+        """Serialize obj to a JSON str (sent as a text frame, like json.dumps)."""
+        return orjson.dumps(obj).decode()
+    
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    _loads = orjson.loads
+else:
+    _dumps = json.dumps
+    _loads = json.loads
 
 # Initialize colorama for colored terminal output
 init()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("lockbox_server.log"),
-        logging.StreamHandler()
-    ]
-)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+class _ColorFormatter(logging.Formatter):
+    """Formatter coloring whole console lines by level (the log file stays plain)."""
+    
+    LEVEL_COLORS = {
+        logging.INFO: Fore.GREEN,
+        logging.WARNING: Fore.YELLOW,
+        logging.ERROR: Fore.RED,
+        logging.CRITICAL: Fore.RED
+    }
+    
+    def format(self, record):
+        line = super().format(record)
+        color = self.LEVEL_COLORS.get(record.levelno)
+        return color + line + Style.RESET_ALL if color else line
+
+# Configure logging. The server logger has its own handlers, written from a
+# listener thread like the controller's, so the event loop never blocks on them.
+_file_handler = logging.FileHandler("lockbox_server.log")
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(_ColorFormatter(LOG_FORMAT))
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, _file_handler, _console_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flush the queued records on exit
 
 logger = logging.getLogger("LockboxServer")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False  # The root logger is configured by app_game_control
 
 # Default WebSocket server settings
 DEFAULT_HOST = "0.0.0.0"  # Listen on all interfaces
@@ -45,6 +93,59 @@ DEFAULT_PORT = 8765
 DEFAULT_AUTH_ENABLED = False
 DEFAULT_ADMIN_TOKEN = "lockbox-admin"
 
+# Joystick update message with a %d slot per value, filled from the controller's
+# value tuple (ordered like JOYSTICK_KEYS) in a single formatting step
+JOYSTICK_UPDATE_TEMPLATE = ('{"type":"joystick_update","joysticks":{'
+                            + ",".join('"%s":%%d' % key for key in JOYSTICK_KEYS)
+                            + '}}')
+
+# Unsent bytes above which a client is skipped by broadcasts until it catches up
+CLIENT_WRITE_BUFFER_LIMIT = 64 * 1024
+
+# TCP keepalive replacing the WebSocket pings: probe after 60 s idle, every 30 s, 4 probes
+TCP_KEEPALIVE_IDLE = 60
+TCP_KEEPALIVE_INTERVAL = 30
+TCP_KEEPALIVE_COUNT = 4
+
+# Admin command reply: command name, result field name, result JSON
+ADMIN_RESPONSE_TEMPLATE = '{"type":"admin_response","command":"%s","%s":%s}'
+
+# Number of lock state changes kept in the history
+LOCK_STATE_HISTORY = 1024
+
+# Keepalive sent by the dashboards (JSON.stringify({type: 'ping'})) and its reply
+PING_MESSAGE = '{"type":"ping"}'
+PONG_TEMPLATE = '{"type":"pong","timestamp":"%s"}'
+
+# Seconds during which joystick samples are merged into a single broadcast
+JOYSTICK_COALESCE_WINDOW = 0.015
+
+# State message sent to new clients: cached lockbox part, then the live server info
+STATE_TEMPLATE = '{"type":"state",%s,"server_info":%s}'
+
+def _enable_tcp_keepalive(websocket):
+    """Let the kernel detect dead clients instead of a per-connection ping task.
+    
+    Args:
+        websocket: The accepted WebSocket connection
+    """
+    transport = getattr(websocket, "transport", None)
+    sock = transport.get_extra_info("socket") if transport is not None else None
+    if sock is None:
+        return
+    
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # The tuning options are not available on every platform
+        for option, value in (("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE),
+                              ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL),
+                              ("TCP_KEEPCNT", TCP_KEEPALIVE_COUNT)):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+    except OSError as e:
+        logger.warning("Could not enable TCP keepalive: %s", e)
+
+
 class LockboxWebSocketServer:
     """WebSocket server for the Lockbox system."""
     
@@ -63,14 +164,32 @@ class LockboxWebSocketServer:
         self.admin_token = admin_token
         self.clients = set()
         self.authenticated_clients = set()
-        self.client_info = {}  # Stores metadata about connected clients
+        self.client_info = {}  # Metadata about connected clients, keyed by websocket
         self.lockbox = LockboxController(auto_reconnect=True)
         self.running = False
         self.server = None
         self.loop = None
-        self.lock_states = []  # History of lock state changes
+        self.lock_states = deque(maxlen=LOCK_STATE_HISTORY)  # Latest lock state changes
         self.session_id = str(uuid.uuid4())[:8]  # Unique session identifier
         self.start_time = datetime.now()
+        self._start_time_iso = self.start_time.isoformat()
+        self._start_monotonic = time.monotonic()
+        self._uptime_cache = (0, "0:00:00")  # Whole seconds of uptime, formatted string
+        self._joystick_subscribed = False  # joystick_update_handler registered on the lockbox
+        self._state_cache = (None, None, None, "")  # joysticks, leds, connected, JSON fields
+        self._stop_event = None  # asyncio.Event set by stop_server, created on the running loop
+        self._last_joystick_json = None  # Last joystick update broadcast
+        self._joystick_event = None  # asyncio.Event set when joystick values changed
+        self._joystick_pending = False  # _joystick_event set or about to be
+        self._joystick_task = None
+        
+        # Handlers of the client message types, called with (data, websocket)
+        self._message_handlers = {
+            "led_control": self._handle_led_control,
+            "ping": self._handle_ping,
+            "get_state": self._handle_get_state,
+            "admin_command": self._handle_admin
+        }
         
     async def register_client(self, websocket, path):
         """Register a new WebSocket client.
@@ -85,22 +204,26 @@ class LockboxWebSocketServer:
         client_id = id(websocket)
         remote_addr = websocket.remote_address if hasattr(websocket, 'remote_address') else "unknown"
         
+        _enable_tcp_keepalive(websocket)
+        
         self.clients.add(websocket)
-        self.client_info[client_id] = {
+        # Attached to the connection for the per-message counters, indexed for admin listings
+        websocket.lb_info = self.client_info[websocket] = {
             "id": client_id,
             "address": remote_addr,
-            "connected_at": datetime.now(),
+            "connected_monotonic": time.monotonic(),  # Wall-clock time derived for the admin list
             "authenticated": not self.auth_enabled,  # Auto-authenticate if auth is disabled
             "is_admin": False,
             "messages_received": 0,
             "messages_sent": 0
         }
         
-        logger.info(f"{Fore.GREEN}Client connected from {remote_addr}. Total clients: {len(self.clients)}{Style.RESET_ALL}")
+        logger.info("Client connected from %s. Total clients: %s", remote_addr, len(self.clients))
         
         # Add to authenticated clients if auth is disabled
         if not self.auth_enabled:
             self.authenticated_clients.add(websocket)
+            self._update_joystick_subscription()
             return True
         
         # If auth is enabled, wait for authentication
@@ -112,17 +235,29 @@ class LockboxWebSocketServer:
         Args:
             websocket: The WebSocket connection to unregister
         """
-        client_id = id(websocket)
-        
         self.clients.discard(websocket)
         self.authenticated_clients.discard(websocket)
+        self._update_joystick_subscription()
         
-        if client_id in self.client_info:
-            client_addr = self.client_info[client_id]["address"]
-            logger.info(f"{Fore.YELLOW}Client disconnected from {client_addr}. Total clients: {len(self.clients)}{Style.RESET_ALL}")
-            del self.client_info[client_id]
+        info = self.client_info.pop(websocket, None)
+        if info is not None:
+            logger.info("Client disconnected from %s. Total clients: %s", info["address"], len(self.clients))
         else:
-            logger.info(f"{Fore.YELLOW}Unknown client disconnected. Total clients: {len(self.clients)}{Style.RESET_ALL}")
+            logger.info("Unknown client disconnected. Total clients: %s", len(self.clients))
+    
+    def _update_joystick_subscription(self):
+        """Receive joystick updates only while someone can be sent them.
+        
+        With no authenticated client, the handler is unregistered so the
+        lockbox skips building and scheduling broadcasts nobody would get.
+        """
+        if self.authenticated_clients:
+            if not self._joystick_subscribed:
+                self.lockbox.register_joystick_callback(self.joystick_update_handler)
+                self._joystick_subscribed = True
+        elif self._joystick_subscribed:
+            self.lockbox.unregister_joystick_callback()
+            self._joystick_subscribed = False
     
     async def authenticate_client(self, websocket, token):
         """Authenticate a client with the provided token.
@@ -142,14 +277,15 @@ class LockboxWebSocketServer:
         # For demo, accept any non-empty token
         if token:
             self.authenticated_clients.add(websocket)
-            if client_id in self.client_info:
-                self.client_info[client_id]["authenticated"] = True
-                self.client_info[client_id]["is_admin"] = is_admin
+            self._update_joystick_subscription()
+            info = websocket.lb_info
+            info["authenticated"] = True
+            info["is_admin"] = is_admin
             
-            logger.info(f"{Fore.GREEN}Client {client_id} authenticated {'as admin' if is_admin else ''}{Style.RESET_ALL}")
+            logger.info("Client %s authenticated %s", client_id, 'as admin' if is_admin else '')
             return True
         else:
-            logger.warning(f"{Fore.YELLOW}Client {client_id} failed authentication{Style.RESET_ALL}")
+            logger.warning("Client %s failed authentication", client_id)
             return False
     
     async def send_to_all_clients(self, message, authenticated_only=True):
@@ -159,22 +295,42 @@ class LockboxWebSocketServer:
             message: The message to send (will be converted to JSON)
             authenticated_only: Only send to authenticated clients
         """
+        # Convert message to JSON string
+        await self.send_json_to_all_clients(_dumps(message), authenticated_only)
+    
+    async def send_json_to_all_clients(self, json_message, authenticated_only=True):
+        """Send an already serialized message to all connected clients.
+        
+        Args:
+            json_message: The message to send (JSON string)
+            authenticated_only: Only send to authenticated clients
+        """
+        self._broadcast_json(json_message, authenticated_only)
+    
+    def _broadcast_json(self, json_message, authenticated_only=True):
+        """Broadcast an already serialized message; must run on the event loop.
+        
+        Args:
+            json_message: The message to send (JSON string)
+            authenticated_only: Only send to authenticated clients
+        """
         target_clients = self.authenticated_clients if authenticated_only else self.clients
         
         if not target_clients:
             return
-            
-        # Convert message to JSON string
-        json_message = json.dumps(message)
         
-        # Create tasks for sending to each client
-        send_tasks = []
-        for websocket in target_clients.copy():  # Use copy to avoid modification during iteration
-            send_tasks.append(asyncio.create_task(self.send_to_client(websocket, json_message)))
-            
-        # Wait for all send tasks to complete
-        if send_tasks:
-            await asyncio.gather(*send_tasks, return_exceptions=True)
+        # broadcast() does not wait for the clients to read: leave out those whose
+        # unsent data already exceeds the limit, they get the next message instead
+        ready_clients = []
+        for websocket in target_clients:
+            if websocket.transport.get_write_buffer_size() <= CLIENT_WRITE_BUFFER_LIMIT:
+                ready_clients.append(websocket)
+                websocket.lb_info["messages_sent"] += 1
+        
+        # Single synchronous fan-out: websockets.broadcast writes the frame to every
+        # open connection without creating a task per client and skips closed ones.
+        # Closed connections are cleaned up by handle_client when their loop ends.
+        websockets.broadcast(ready_clients, json_message)
     
     async def send_to_client(self, websocket, message):
         """Send a message to a specific client, handling errors.
@@ -183,17 +339,22 @@ class LockboxWebSocketServer:
             websocket: The WebSocket connection to send to
             message: The message to send (JSON string)
         """
-        client_id = id(websocket)
-        
         try:
             await websocket.send(message)
-            if client_id in self.client_info:
-                self.client_info[client_id]["messages_sent"] += 1
+            websocket.lb_info["messages_sent"] += 1
         except websockets.exceptions.ConnectionClosed:
             # Client disconnected, clean up
             await self.unregister_client(websocket)
         except Exception as e:
-            logger.error(f"{Fore.RED}Error sending to client {client_id}: {e}{Style.RESET_ALL}")
+            logger.error("Error sending to client %s: %s", id(websocket), e)
+    
+    async def send_pong(self, websocket):
+        """Answer a client's ping.
+        
+        Args:
+            websocket: The WebSocket connection to send to
+        """
+        await self.send_to_client(websocket, PONG_TEMPLATE % datetime.now().isoformat())
     
     async def send_state_to_client(self, websocket):
         """Send the current state to a specific client.
@@ -201,21 +362,43 @@ class LockboxWebSocketServer:
         Args:
             websocket: The WebSocket connection to send to
         """
-        # Create a state update with both joystick and LED values
-        state = {
-            "type": "state",
-            "joysticks": self.lockbox.get_joystick_values(),
-            "leds": self.lockbox.get_led_values(),
-            "arduino_connected": self.lockbox.get_connection_status(),
-            "server_info": {
-                "session_id": self.session_id,
-                "uptime": str(datetime.now() - self.start_time).split('.')[0],  # Format as HH:MM:SS
-                "clients_connected": len(self.clients)
-            }
+        # Only the server info changes between clients; the lockbox part is cached
+        server_info = {
+            "session_id": self.session_id,
+            "uptime": self._uptime(),
+            "clients_connected": len(self.clients)
         }
         
         # Send as JSON
-        await self.send_to_client(websocket, json.dumps(state))
+        await self.send_to_client(websocket, STATE_TEMPLATE % (self._lockbox_state_json(), _dumps(server_info)))
+    
+    def _uptime(self):
+        """Get the server uptime formatted as H:MM:SS, reformatted at most once per second."""
+        seconds = int(time.monotonic() - self._start_monotonic)
+        cached = self._uptime_cache
+        if cached[0] != seconds:
+            self._uptime_cache = cached = (seconds, str(timedelta(seconds=seconds)))
+        return cached[1]
+    
+    def _lockbox_state_json(self):
+        """Get the joystick, LED and Arduino status fields of the state message.
+        
+        The values are compared as tuples, so the JSON is only re-encoded
+        when one of them changes.
+        
+        Returns:
+            str: JSON object members, without the enclosing braces
+        """
+        joysticks = self.lockbox.get_joystick_tuple()
+        leds = self.lockbox.get_led_tuple()
+        connected = self.lockbox.get_connection_status()
+        
+        cached = self._state_cache
+        if cached[0] != joysticks or cached[1] != leds or cached[2] != connected:
+            fields = '"joysticks":%s,"leds":%s,"arduino_connected":%s' % (
+                _dumps(dict(zip(JOYSTICK_KEYS, joysticks))), _dumps(dict(zip(LED_KEYS, leds))), _dumps(connected))
+            self._state_cache = cached = (joysticks, leds, connected, fields)
+        return cached[3]
     
     async def handle_client(self, websocket, path):
         """Handle WebSocket client connection.
@@ -232,7 +415,7 @@ class LockboxWebSocketServer:
             await self.send_state_to_client(websocket)
         else:
             # Send authentication required message
-            await self.send_to_client(websocket, json.dumps({
+            await self.send_to_client(websocket, _dumps({
                 "type": "auth_required",
                 "message": "Authentication required"
             }))
@@ -240,13 +423,16 @@ class LockboxWebSocketServer:
         try:
             # Process messages from this client
             async for message in websocket:
+                # Fast path for the dashboards' ping: answered without JSON parsing
+                if message == PING_MESSAGE and (authenticated or not self.auth_enabled):
+                    websocket.lb_info["messages_received"] += 1
+                    await self.send_pong(websocket)
+                    continue
+                
                 try:
-                    data = json.loads(message)
-                    client_id = id(websocket)
-                    
+                    data = _loads(message)
                     # Update message counter
-                    if client_id in self.client_info:
-                        self.client_info[client_id]["messages_received"] += 1
+                    websocket.lb_info["messages_received"] += 1
                     
                     # Handle authentication if needed
                     if not authenticated and data.get("type") == "auth":
@@ -258,7 +444,7 @@ class LockboxWebSocketServer:
                             await self.send_state_to_client(websocket)
                         else:
                             # Send auth failed message
-                            await self.send_to_client(websocket, json.dumps({
+                            await self.send_to_client(websocket, _dumps({
                                 "type": "auth_failed",
                                 "message": "Authentication failed"
                             }))
@@ -269,9 +455,9 @@ class LockboxWebSocketServer:
                         await self.process_client_message(data, websocket)
                     
                 except json.JSONDecodeError:
-                    logger.warning(f"{Fore.YELLOW}Invalid JSON received: {message}{Style.RESET_ALL}")
+                    logger.warning("Invalid JSON received: %s", message)
                 except Exception as e:
-                    logger.error(f"{Fore.RED}Error processing message: {e}{Style.RESET_ALL}")
+                    logger.error("Error processing message: %s", e)
                     
         except websockets.exceptions.ConnectionClosed:
             pass
@@ -288,52 +474,54 @@ class LockboxWebSocketServer:
         """
         # Check message type
         if "type" not in data:
-            logger.warning(f"{Fore.YELLOW}Received message with no type: {data}{Style.RESET_ALL}")
+            logger.warning("Received message with no type: %s", data)
             return
-            
-        message_type = data["type"]
-        client_id = id(websocket)
-        is_admin = self.client_info.get(client_id, {}).get("is_admin", False)
         
-        # Handle different message types
-        if message_type == "led_control":
-            try:
-                leds = data.get("leds", {})
-                self.lockbox.set_led_values(
-                    led1=leds.get("led1"),
-                    led2=leds.get("led2"),
-                    led3=leds.get("led3")
-                )
-                
-                # Record lock state change
-                self.lock_states.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "leds": self.lockbox.get_led_values(),
-                    "client_id": client_id
-                })
-                
-                # Forward the updated LED state to all clients
-                await self.send_to_all_clients({
-                    "type": "led_update",
-                    "leds": self.lockbox.get_led_values()
-                })
-                
-            except Exception as e:
-                logger.error(f"{Fore.RED}Error handling LED control: {e}{Style.RESET_ALL}")
-                
-        elif message_type == "ping":
-            # Simple ping-pong for connection testing
-            await self.send_to_client(websocket, json.dumps({
-                "type": "pong",
-                "timestamp": datetime.now().isoformat()
-            }))
+        # Handle different message types (unknown types are ignored)
+        handler = self._message_handlers.get(data["type"])
+        if handler is not None:
+            await handler(data, websocket)
+    
+    async def _handle_led_control(self, data, websocket):
+        """Apply a client's LED values and forward them to all clients."""
+        try:
+            leds = data.get("leds", {})
+            self.lockbox.set_led_values(
+                led1=leds.get("led1"),
+                led2=leds.get("led2"),
+                led3=leds.get("led3")
+            )
             
-        elif message_type == "get_state":
-            # Send current state to the requesting client
-            await self.send_state_to_client(websocket)
+            # Same snapshot for the history and the clients
+            led_values = self.lockbox.get_led_values()
+            
+            # Record lock state change
+            self.lock_states.append({
+                "timestamp": datetime.now().isoformat(),
+                "leds": led_values,
+                "client_id": id(websocket)
+            })
+            
+            # Forward the updated LED state to all clients
+            await self.send_to_all_clients({
+                "type": "led_update",
+                "leds": led_values
+            })
             
-        elif message_type == "admin_command" and is_admin:
-            # Process admin commands
+        except Exception as e:
+            logger.error("Error handling LED control: %s", e)
+    
+    async def _handle_ping(self, data, websocket):
+        """Simple ping-pong for connection testing."""
+        await self.send_pong(websocket)
+    
+    async def _handle_get_state(self, data, websocket):
+        """Send current state to the requesting client."""
+        await self.send_state_to_client(websocket)
+    
+    async def _handle_admin(self, data, websocket):
+        """Process admin commands, from admin clients only."""
+        if websocket.lb_info["is_admin"]:
             await self.handle_admin_command(data, websocket)
     
     async def handle_admin_command(self, data, websocket):
@@ -348,36 +536,33 @@ class LockboxWebSocketServer:
         if command == "diagnostic":
             # Run diagnostic on Arduino connection
             diag_results = self.lockbox.run_diagnostic()
-            await self.send_to_client(websocket, json.dumps({
-                "type": "admin_response",
-                "command": "diagnostic",
-                "results": diag_results
-            }))
+            await self.send_to_client(websocket, ADMIN_RESPONSE_TEMPLATE % (
+                "diagnostic", "results", _dumps(diag_results)))
             
         elif command == "server_status":
             # Send detailed server status
-            await self.send_to_client(websocket, json.dumps({
-                "type": "admin_response",
-                "command": "server_status",
-                "status": {
-                    "session_id": self.session_id,
-                    "uptime": str(datetime.now() - self.start_time).split('.')[0],
-                    "start_time": self.start_time.isoformat(),
-                    "client_count": len(self.clients),
-                    "authenticated_clients": len(self.authenticated_clients),
-                    "arduino_connected": self.lockbox.get_connection_status(),
-                    "lock_state_changes": len(self.lock_states)
-                }
-            }))
+            status = {
+                "session_id": self.session_id,
+                "uptime": self._uptime(),
+                "start_time": self._start_time_iso,
+                "client_count": len(self.clients),
+                "authenticated_clients": len(self.authenticated_clients),
+                "arduino_connected": self.lockbox.get_connection_status(),
+                "lock_state_changes": len(self.lock_states)
+            }
+            await self.send_to_client(websocket, ADMIN_RESPONSE_TEMPLATE % (
+                "server_status", "status", _dumps(status)))
             
         elif command == "client_list":
             # Send list of connected clients
             client_list = []
-            for cid, info in self.client_info.items():
+            now, now_monotonic = datetime.now(), time.monotonic()
+            for info in self.client_info.values():
+                connected_at = now - timedelta(seconds=now_monotonic - info["connected_monotonic"])
                 client_list.append({
-                    "id": str(cid),
+                    "id": str(info["id"]),
                     "address": info["address"],
-                    "connected_at": info["connected_at"].isoformat(),
+                    "connected_at": connected_at.isoformat(),
                     "authenticated": info["authenticated"],
                     "is_admin": info["is_admin"],
                     "messages": {
@@ -386,22 +571,16 @@ class LockboxWebSocketServer:
                     }
                 })
                 
-            await self.send_to_client(websocket, json.dumps({
-                "type": "admin_response",
-                "command": "client_list",
-                "clients": client_list
-            }))
+            await self.send_to_client(websocket, ADMIN_RESPONSE_TEMPLATE % (
+                "client_list", "clients", _dumps(client_list)))
             
         elif command == "reset_arduino":
             # Attempt to reset the Arduino connection
             self.lockbox.disconnect()
             success = self.lockbox.connect() and self.lockbox.start()
             
-            await self.send_to_client(websocket, json.dumps({
-                "type": "admin_response",
-                "command": "reset_arduino",
-                "success": success
-            }))
+            await self.send_to_client(websocket, ADMIN_RESPONSE_TEMPLATE % (
+                "reset_arduino", "success", _dumps(success)))
             
             # If successful, notify all clients of the new state
             if success:
@@ -413,21 +592,53 @@ class LockboxWebSocketServer:
     def joystick_update_handler(self, joystick_values):
         """Handle joystick updates from the lockbox controller.
         
-        This callback runs in the lockbox controller's thread, so we need
-        to safely schedule the WebSocket send in the asyncio event loop.
+        The controller calls this from the event loop when it was started
+        from it, otherwise from its own thread. Updates are only flagged
+        here; _joystick_broadcast_loop sends the latest values once per
+        JOYSTICK_COALESCE_WINDOW, however many samples arrived meanwhile.
         
         Args:
             joystick_values: Dict with the current joystick values
         """
-        # Create the message to send
-        message = {
-            "type": "joystick_update",
-            "joysticks": joystick_values
-        }
+        loop = self.loop
+        event = self._joystick_event
+        if event is None or not loop.is_running() or self._joystick_pending:
+            return
+        self._joystick_pending = True
         
-        # Schedule the send_to_all_clients coroutine in the asyncio event loop
-        if self.loop and self.loop.is_running():
-            asyncio.run_coroutine_threadsafe(self.send_to_all_clients(message), self.loop)
+        if self._on_loop_thread():
+            event.set()
+        else:
+            # Only the first sample of a window wakes the event loop
+            loop.call_soon_threadsafe(event.set)
+    
+    async def _joystick_broadcast_loop(self):
+        """Broadcast the joystick values flagged by joystick_update_handler."""
+        event = self._joystick_event
+        while True:
+            await event.wait()
+            
+            # Let the samples of the coalescing window arrive, then send the latest one
+            await asyncio.sleep(JOYSTICK_COALESCE_WINDOW)
+            event.clear()
+            self._joystick_pending = False
+            
+            # Create the message to send, formatted directly as JSON
+            json_message = JOYSTICK_UPDATE_TEMPLATE % self.lockbox.get_joystick_tuple()
+            
+            # Nothing moved since the last broadcast: clients already have these values
+            if json_message == self._last_joystick_json:
+                continue
+            self._last_joystick_json = json_message
+            
+            self._broadcast_json(json_message)
+    
+    def _on_loop_thread(self):
+        """Tell whether the caller is running inside the server's event loop."""
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
     
     def connection_status_handler(self, connected):
         """Handle Arduino connection status changes.
@@ -441,14 +652,14 @@ class LockboxWebSocketServer:
             "connected": connected
         }
         
-        # Schedule the send_to_all_clients coroutine in the asyncio event loop
+        # Broadcast from the asyncio event loop
         if self.loop and self.loop.is_running():
-            asyncio.run_coroutine_threadsafe(self.send_to_all_clients(message), self.loop)
+            self.loop.call_soon_threadsafe(self._broadcast_json, _dumps(message))
             
         if connected:
-            logger.info(f"{Fore.GREEN}Arduino connection established{Style.RESET_ALL}")
+            logger.info("Arduino connection established")
         else:
-            logger.warning(f"{Fore.YELLOW}Arduino connection lost{Style.RESET_ALL}")
+            logger.warning("Arduino connection lost")
     
     async def start_server(self):
         """Start the WebSocket server.
@@ -458,16 +669,15 @@ class LockboxWebSocketServer:
         """
         # Connect to the lockbox
         if not self.lockbox.connect():
-            logger.error(f"{Fore.RED}Failed to connect to lockbox controller{Style.RESET_ALL}")
+            logger.error("Failed to connect to lockbox controller")
             return False
         
-        # Register callbacks
-        self.lockbox.register_joystick_callback(self.joystick_update_handler)
+        # Register callbacks (the joystick one follows the connected clients)
         self.lockbox.register_connection_status_callback(self.connection_status_handler)
         
         # Start the lockbox communication
         if not self.lockbox.start():
-            logger.error(f"{Fore.RED}Failed to start lockbox controller{Style.RESET_ALL}")
+            logger.error("Failed to start lockbox controller")
             return False
         
         # Start the WebSocket server
@@ -476,24 +686,32 @@ class LockboxWebSocketServer:
                 self.handle_client, 
                 self.host, 
                 self.port,
-                ping_interval=30,  # Send ping every 30 seconds
-                ping_timeout=10    # Wait 10 seconds for pong
+                ping_interval=None,  # Dead peers are detected by TCP keepalive (see register_client)
+                compression=None,    # Frames are tiny JSON: deflate costs more than it saves
+                max_size=16384,      # Client messages are small commands
+                max_queue=32,
+                read_limit=65536,
+                write_limit=65536
             )
             self.running = True
-            self.loop = asyncio.get_event_loop()
+            self.loop = asyncio.get_running_loop()
+            self._stop_event = asyncio.Event()
+            self._joystick_event = asyncio.Event()
+            self._joystick_task = asyncio.create_task(self._joystick_broadcast_loop())
             
-            logger.info(f"{Fore.GREEN}WebSocket server started at ws://{self.host}:{self.port}{Style.RESET_ALL}")
+            logger.info("WebSocket server started at ws://%s:%s", self.host, self.port)
             print(f"\n{'='*50}")
             print(f"  Lockbox WebSocket Server Running")
             print(f"  Session ID: {self.session_id}")
             print(f"  Listening on: ws://{self.host}:{self.port}")
             print(f"  Authentication: {'Enabled' if self.auth_enabled else 'Disabled'}")
+            print(f"  Event loop: {type(self.loop).__module__}")
             print(f"  Press Ctrl+C to stop the server")
             print(f"{'='*50}\n")
             
             return True
         except Exception as e:
-            logger.error(f"{Fore.RED}Error starting WebSocket server: {e}{Style.RESET_ALL}")
+            logger.error("Error starting WebSocket server: %s", e)
             return False
     
     async def stop_server(self):
@@ -502,11 +720,15 @@ class LockboxWebSocketServer:
             self.running = False
             self.server.close()
             await self.server.wait_closed()
-            logger.info(f"{Fore.YELLOW}WebSocket server stopped{Style.RESET_ALL}")
+            logger.info("WebSocket server stopped")
         
         # Disconnect from lockbox
         self.lockbox.disconnect()
         
+        if self._joystick_task is not None:
+            self._joystick_task.cancel()
+            self._joystick_task = None
+        
         # Notify all clients about shutdown
         shutdown_message = {
             "type": "server_shutdown",
@@ -516,6 +738,10 @@ class LockboxWebSocketServer:
             await self.send_to_all_clients(shutdown_message, authenticated_only=False)
         except:
             pass
+        
+        # Wake up main(), which is waiting for the server to stop
+        if self._stop_event is not None:
+            self._stop_event.set()
 
 
 def handle_shutdown(server_instance, loop):
@@ -548,15 +774,19 @@ def handle_shutdown(server_instance, loop):
     print(f"{Fore.GREEN}Server stopped.{Style.RESET_ALL}")
 
 
-async def main():
-    """Main entry point for the WebSocket server."""
+async def main(argv=None):
+    """Main entry point for the WebSocket server.
+    
+    Args:
+        argv: Command line arguments, sys.argv[1:] when None
+    """
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Lockbox WebSocket Server")
     parser.add_argument("--host", default=DEFAULT_HOST, help=f"Host to bind the server to (default: {DEFAULT_HOST})")
     parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to bind the server to (default: {DEFAULT_PORT})")
     parser.add_argument("--auth", action="store_true", help="Enable authentication")
     parser.add_argument("--admin-token", default=DEFAULT_ADMIN_TOKEN, help=f"Admin token for privileged commands (default: {DEFAULT_ADMIN_TOKEN})")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Create server with parsed arguments
     server = LockboxWebSocketServer(
@@ -567,7 +797,7 @@ async def main():
     )
     
     # Setup signal handlers for graceful shutdown
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     
     # Platform-specific signal handling (Windows doesn't support loop.add_signal_handler)
     try:
@@ -582,18 +812,47 @@ async def main():
                 # Use alternative signal handling below
                 pass
     except Exception as e:
-        logger.warning(f"{Fore.YELLOW}Error setting up signal handlers: {e}. Using fallback method.{Style.RESET_ALL}")
+        logger.warning("Error setting up signal handlers: %s. Using fallback method.", e)
     
     # Start the server
     if await server.start_server():
         try:
-            # Keep the server running
-            while server.running:
-                await asyncio.sleep(1)
+            # Keep the server running until stop_server() is called
+            await server._stop_event.wait()
         except KeyboardInterrupt:
             # This will catch Ctrl+C on Windows
             await server.stop_server()
 
 
+def _remove_pid_file(path):
+    """Remove the PID file written by the launcher if it still names this server.
+    
+    The launcher may record the PID of a venv redirector whose child is this
+    process, so the parent PID is accepted too.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            pid = int(f.read())
+        if pid in (os.getpid(), os.getppid()):
+            os.remove(path)
+    except (OSError, ValueError):
+        pass
+
+
+def run(argv=None):
+    """Run main() on uvloop when it is installed, on the default asyncio loop otherwise.
+    
+    Args:
+        argv: Command line arguments, sys.argv[1:] when None
+    """
+    # Set by start_lockbox.py, which reuses a running server while this file exists
+    pid_file = os.environ.get("LOCKBOX_PID_FILE")
+    if pid_file:
+        atexit.register(_remove_pid_file, pid_file)
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(main(argv))
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -11,13 +11,10 @@ import sys
 import re
 import subprocess
 import logging
+import socket
 import time
+from pathlib import Path
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger("StartupScript")
 
 # Chemins des fichiers
@@ -25,20 +22,103 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SERVER_DIR = os.path.join(BASE_DIR, "server")
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 HTML_FILE = os.path.join(TEMPLATES_DIR, "serrure.html")
+
+# Tampon des fichiers déjà corrigés (nom:mtime_ns:taille), pour éviter de les relire
+PATCH_STAMP = Path(BASE_DIR, ".lockbox_patched")
+
+# Adresse d'écoute du serveur WebSocket et délai maximal de démarrage
+SERVER_HOST = "localhost"
+SERVER_PORT = 8765
+STARTUP_TIMEOUT = 5.0
+
+# PID du serveur lancé, pour ne pas en démarrer un second
+SERVER_PID_FILE = Path(BASE_DIR, ".lockbox_server.pid")
 SERVER_SCRIPT = os.path.join(SERVER_DIR, "ws_server.py")
 
+# Motifs des correctifs, compilés une seule fois au chargement du module
+_JOYSTICK_STRUCT_RE = re.compile(r'self\.joystick_values = \{\s*"joystick1": \d+,\s*"joystick2": \d+,\s*"joystick3": \d+\s*\}')
+# Traitement joystick remplacé, avec sa branche else qui utilise la variable values supprimée
+_JOYSTICK_HANDLER_RE = re.compile(r'# Handle joystick data.*?self\.joystick_callback\(self\.joystick_values\).*?logger\.debug\(f"Joystick values: \{self\.joystick_values\}"\)(?:\s*else:\s*logger\.warning\([^\n]*\))?', re.DOTALL)
+
+# Motif compilé injecté dans app_game_control.py avec le nouveau traitement joystick
+_J_RE_DEFINITION = "_J_RE = re.compile(r'J(\\d+),(\\d+),(\\d+),(\\d+),(\\d+),(\\d+)$')\n\n"
+_FIRST_CLASS_RE = re.compile(r'^class ', re.MULTILINE)
+_IMPORT_RE_RE = re.compile(r'^import re$', re.MULTILINE)
+
+# Ancres littérales des blocs remplacés dans ws_server.py (recherche avec str.find)
+_SIGNAL_LOOP_START = "for sig in (signal.SIGINT, signal.SIGTERM):"
+_SIGNAL_LOOP_HANDLER = "lambda: handle_shutdown(server, loop)"
+_SERVER_WAIT_START = "# Keep the server running"
+_SERVER_WAIT_END = "await asyncio.sleep(1)"
+_MAIN_DEF_RE = re.compile(r"async def main\(")
+_IF_NAME_RE = re.compile(r"if __name__ ==")
+
+def _file_signature(path):
+    """Signature d'un fichier basée sur stat(), sans lire son contenu."""
+    st = path.stat()
+    return f"{path.name}:{st.st_mtime_ns}:{st.st_size}"
+
+def _read_stamps():
+    """Lit les signatures enregistrées dans le fichier tampon."""
+    try:
+        return set(PATCH_STAMP.read_text(encoding='utf-8').split())
+    except OSError:
+        return set()
+
+def _already_patched(path):
+    """Vrai si le fichier n'a pas changé depuis la dernière correction réussie."""
+    return _file_signature(path) in _read_stamps()
+
+def _record_patched(path):
+    """Enregistre la signature actuelle du fichier dans le tampon."""
+    try:
+        prefix = path.name + ":"
+        stamps = {s for s in _read_stamps() if not s.startswith(prefix)}
+        stamps.add(_file_signature(path))
+        PATCH_STAMP.write_text("\n".join(sorted(stamps)) + "\n", encoding='utf-8')
+    except OSError as e:
+        logger.warning(f"Impossible d'écrire le tampon de correctifs: {e}")
+
+class FileEditor:
+    """Fichier source lu une seule fois, modifié en mémoire puis réécrit s'il a changé."""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.original = self.path.read_text(encoding='utf-8')
+        self.content = self.original
+    
+    def sub(self, pattern, replacement):
+        """Applique un motif compilé au contenu et retourne le nombre de remplacements."""
+        self.content, count = pattern.subn(replacement, self.content)
+        return count
+    
+    @property
+    def changed(self):
+        """Vrai si le contenu en mémoire diffère du fichier sur disque."""
+        return self.content != self.original
+    
+    def save(self):
+        """Écrit le contenu seulement s'il a changé. Retourne True si le fichier a été écrit."""
+        if not self.changed:
+            return False
+        self.path.write_text(self.content, encoding='utf-8')
+        self.original = self.content
+        return True
+
 def fix_arduino_data_format():
     """Corrige la façon dont les données de joystick sont traitées dans app_game_control.py."""
     try:
-        app_control_file = os.path.join(SERVER_DIR, "app_game_control.py")
+        app_control_file = Path(SERVER_DIR, "app_game_control.py")
         
-        with open(app_control_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if _already_patched(app_control_file):
+            logger.info("Les correctifs Arduino sont déjà appliqués")
+            return True
+        
+        editor = FileEditor(app_control_file)
             
         # 1. Ajouter X,Y à la structure de données joystick_values
-        if '"joystick1X"' not in content:
+        if '"joystick1X"' not in editor.content:
             logger.info("Ajout des coordonnées X,Y aux valeurs de joystick")
-            pattern = r'self\.joystick_values = \{\s*"joystick1": \d+,\s*"joystick2": \d+,\s*"joystick3": \d+\s*\}'
             replacement = '''self.joystick_values = {
             "joystick1": 512,
             "joystick2": 512,
@@ -50,25 +130,20 @@ def fix_arduino_data_format():
             "joystick3X": 512,
             "joystick3Y": 512
         }'''
-            content = re.sub(pattern, replacement, content)
+            editor.sub(_JOYSTICK_STRUCT_RE, replacement)
         
         # 2. Mettre à jour le traitement des données Arduino
-        pattern = r'# Handle joystick data.*?self\.joystick_callback\(self\.joystick_values\).*?logger\.debug\(f"Joystick values: \{self\.joystick_values\}"\)'
-        if 'joystick1X' not in content or not re.search(pattern, content, re.DOTALL):
+        # (test sur le contenu d'origine : l'étape 1 vient peut-être d'ajouter joystick1X)
+        if 'joystick1X' not in editor.original:
             logger.info("Mise à jour du traitement des données de joystick")
             replacement = '''# Handle joystick data (format: J1X,J1Y,J2X,J2Y,J3X,J3Y)
             if content.startswith('J'):
                 try:
-                    # Parse joystick values
-                    values = content[1:].split(',')
-                    if len(values) == 6:
+                    # Parse joystick values in a single pass of the compiled pattern
+                    match = _J_RE.match(content)
+                    if match:
                         # Arduino sends X and Y for each joystick
-                        j1x = int(values[0])
-                        j1y = int(values[1])
-                        j2x = int(values[2])
-                        j2y = int(values[3])
-                        j3x = int(values[4])
-                        j3y = int(values[5])
+                        j1x, j1y, j2x, j2y, j3x, j3y = map(int, match.groups())
                         
                         # Store values in both formats
                         self.joystick_values["joystick1"] = j1x
@@ -90,15 +165,28 @@ def fix_arduino_data_format():
                         if self.joystick_callback:
                             self.joystick_callback(self.joystick_values)
                             
-                        logger.debug(f"Joystick values: {self.joystick_values}")'''
+                        logger.debug(f"Joystick values: {self.joystick_values}")
+                    else:
+                        logger.warning(f"{Fore.YELLOW}Unexpected joystick data format: {content}{Style.RESET_ALL}")'''
                             
-            content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+            replaced = editor.sub(_JOYSTICK_HANDLER_RE, replacement)
             
-        # Enregistrer les modifications
-        with open(app_control_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+            # Définir le motif utilisé par le code injecté, avant la première classe
+            content = editor.content
+            if replaced and "_J_RE = " not in content:
+                definition = _J_RE_DEFINITION
+                if not _IMPORT_RE_RE.search(content):
+                    definition = "import re\n\n" + definition
+                first_class = _FIRST_CLASS_RE.search(content)
+                if first_class:
+                    editor.content = content[:first_class.start()] + definition + content[first_class.start():]
             
-        logger.info("✅ Correctifs Arduino appliqués")
+        # Enregistrer les modifications seulement si le contenu a changé
+        if editor.save():
+            logger.info("✅ Correctifs Arduino appliqués")
+        else:
+            logger.info("Les correctifs Arduino sont déjà appliqués")
+        _record_patched(app_control_file)
         return True
     
     except Exception as e:
@@ -108,18 +196,20 @@ def fix_arduino_data_format():
 def fix_windows_signal_handlers():
     """Corrige les gestionnaires de signaux pour Windows."""
     try:
-        ws_server_file = os.path.join(SERVER_DIR, "ws_server.py")
+        ws_server_file = Path(SERVER_DIR, "ws_server.py")
+        
+        if _already_patched(ws_server_file):
+            logger.info("Les correctifs de signaux Windows sont déjà appliqués")
+            return True
         
-        with open(ws_server_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        editor = FileEditor(ws_server_file)
+        content = editor.content
             
         # Vérifier si le code a déjà été corrigé
         if "Platform-specific signal handling" not in content:
             logger.info("Correction des gestionnaires de signaux pour Windows")
             
             # Chercher le bloc de code à remplacer
-            pattern = r'for sig in \(signal\.SIGINT, signal\.SIGTERM\):\s*loop\.add_signal_handler\(\s*sig,\s*lambda: handle_shutdown\(server, loop\)\s*\)'
-            
             replacement = '''# Platform-specific signal handling (Windows doesn't support loop.add_signal_handler)
     try:
         for sig in (signal.SIGINT, signal.SIGTERM):
@@ -135,11 +225,14 @@ def fix_windows_signal_handlers():
     except Exception as e:
         logger.warning(f"{Fore.YELLOW}Error setting up signal handlers: {e}. Using fallback method.{Style.RESET_ALL}")'''
             
-            content = re.sub(pattern, replacement, content)
+            # Le bloc se termine à la parenthèse fermante de add_signal_handler
+            start = content.find(_SIGNAL_LOOP_START)
+            handler = content.find(_SIGNAL_LOOP_HANDLER, start) if start != -1 else -1
+            end = content.find(")", handler + len(_SIGNAL_LOOP_HANDLER)) if handler != -1 else -1
+            if end != -1:
+                content = content[:start] + replacement + content[end + 1:]
             
             # Chercher la boucle d'attente pour ajouter le gestionnaire KeyboardInterrupt
-            pattern = r'# Keep the server running\s*while server\.running:\s*await asyncio\.sleep\(1\)'
-            
             replacement = '''# Keep the server running
         try:
             while server.running:
@@ -148,43 +241,98 @@ def fix_windows_signal_handlers():
             # This will catch Ctrl+C on Windows
             await server.stop_server()'''
             
-            content = re.sub(pattern, replacement, content)
+            start = content.find(_SERVER_WAIT_START)
+            end = content.find(_SERVER_WAIT_END, start) if start != -1 else -1
+            if end != -1:
+                content = content[:start] + replacement + content[end + len(_SERVER_WAIT_END):]
             
             # Supprimer les définitions en double
-            if content.count("async def main(") > 1:
-                # Trouver la dernière définition
-                last_main_pos = content.rfind("async def main(")
-                if last_main_pos > 0:
-                    # Chercher la fin de la fonction (jusqu'au prochain if __name__)
-                    next_if_name = content.find("if __name__ ==", last_main_pos)
-                    if next_if_name > 0:
-                        # Supprimer la définition en double
-                        content = content[:last_main_pos] + content[next_if_name:]
+            # Un seul parcours pour compter les définitions et trouver la dernière
+            mains = list(_MAIN_DEF_RE.finditer(content))
+            if len(mains) > 1:
+                last_main_pos = mains[-1].start()
+                # Chercher la fin de la fonction (jusqu'au prochain if __name__)
+                next_if_name = _IF_NAME_RE.search(content, last_main_pos)
+                if next_if_name:
+                    # Supprimer la définition en double
+                    content = content[:last_main_pos] + content[next_if_name.start():]
             
-            # Enregistrer les modifications
-            with open(ws_server_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Enregistrer les modifications seulement si le contenu a changé
+            editor.content = content
+            editor.save()
                 
             logger.info("✅ Correctifs signaux Windows appliqués")
-            return True
         else:
             logger.info("Les correctifs de signaux Windows sont déjà appliqués")
-            return True
+        _record_patched(ws_server_file)
+        return True
             
     except Exception as e:
         logger.error(f"Erreur lors de la correction des gestionnaires de signaux: {e}")
         return False
 
+def _process_alive(pid):
+    """Vérifie si un processus existe toujours."""
+    if os.name == 'nt':
+        # Sous Windows, os.kill(pid, 0) terminerait le processus
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))) and exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Le processus existe mais appartient à un autre utilisateur
+        return True
+    return True
+
+def _running_server_pid():
+    """Retourne le PID du serveur déjà lancé, ou None.
+    
+    Un fichier PID illisible ou désignant un processus terminé est supprimé.
+    """
+    try:
+        pid = int(SERVER_PID_FILE.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        pid = None
+    if pid is not None and _process_alive(pid):
+        return pid
+    try:
+        SERVER_PID_FILE.unlink()
+    except OSError:
+        pass
+    return None
+
 def start_server():
-    """Démarre le serveur WebSocket."""
+    """Démarre le serveur WebSocket, sauf s'il tourne déjà."""
     try:
+        pid = _running_server_pid()
+        if pid is not None:
+            logger.info(f"Serveur WebSocket déjà en cours d'exécution (PID {pid})")
+            return True
+        
         logger.info("Démarrage du serveur WebSocket...")
         
         # Changer de répertoire
         os.chdir(SERVER_DIR)
         
-        # Démarrer le serveur
-        subprocess.Popen([sys.executable, "ws_server.py"])
+        # Démarrer le serveur et mémoriser son PID ; le serveur supprime
+        # le fichier indiqué par LOCKBOX_PID_FILE en s'arrêtant
+        env = dict(os.environ, LOCKBOX_PID_FILE=str(SERVER_PID_FILE))
+        proc = subprocess.Popen([sys.executable, "ws_server.py"], env=env)
+        SERVER_PID_FILE.write_text(str(proc.pid), encoding='utf-8')
         
         logger.info("✅ Serveur WebSocket démarré")
         return True
@@ -193,8 +341,25 @@ def start_server():
         logger.error(f"Erreur lors du démarrage du serveur: {e}")
         return False
 
+def wait_for_server(timeout=STARTUP_TIMEOUT):
+    """Attend que le serveur accepte les connexions TCP, au plus timeout secondes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((SERVER_HOST, SERVER_PORT), timeout=0.1).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
 def main():
     """Fonction principale."""
+    # Configuration du logging (ici plutôt qu'à l'import, pour que les modules
+    # qui importent ce script gardent leur propre configuration)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     logger.info("=== Script de démarrage Lockbox ===")
     
     # Appliquer les correctifs
@@ -205,16 +370,17 @@ def main():
         # Démarrer le serveur
         server_started = start_server()
         
-        if server_started:
+        # Attendre que le serveur écoute plutôt qu'un délai fixe
+        if server_started and wait_for_server():
             logger.info("\n" + "="*50)
             logger.info("Serveur démarré avec succès!")
-            logger.info("Interface web disponible à: http://localhost:8765")
+            logger.info(f"Interface web disponible à: http://{SERVER_HOST}:{SERVER_PORT}")
             logger.info("="*50 + "\n")
             
-            # Attendre un peu pour que le serveur démarre
-            time.sleep(2)
-            
             return 0
+        
+        if server_started:
+            logger.error(f"Le serveur n'écoute pas sur le port {SERVER_PORT} après {STARTUP_TIMEOUT} secondes")
     
     logger.error("Échec du démarrage du serveur. Vérifiez les erreurs ci-dessus.")
     return 1
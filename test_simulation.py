@@ -13,6 +13,18 @@ import time
 import random
 import websockets
 
+try:
+    import orjson  # Optional: faster JSON encoding
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj):
+        """Serialize obj to a JSON str (sent as a text frame, like json.dumps)."""
+        return orjson.dumps(obj).decode()
+else:
+    _dumps = json.dumps
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -53,44 +65,31 @@ def generate_led_values():
         "led3": random.randint(0, 255),
     }
 
+# Message kinds sent in rotation: (type, payload key, value generator, log format)
+MESSAGE_KINDS = (
+    ("joystick_update", "joysticks", generate_joystick_values, "Sending single values: %s"),
+    ("joystick_update", "joysticks", generate_joystick_xy_values, "Sending X,Y pairs: %s"),
+    ("led_update", "leds", generate_led_values, "Sending LED values: %s"),
+)
+
+# Number of updates sent by the simulation
+MESSAGE_COUNT = 50
+
+async def send_one(i, ws):
+    """Send the i-th simulated update, alternating single values, X,Y pairs and LEDs."""
+    msg_type, key, generate, log_format = MESSAGE_KINDS[i % len(MESSAGE_KINDS)]
+    values = generate()
+    logger.info(log_format, values)
+    await ws.send(_dumps({"type": msg_type, key: values}))
+
 async def simulate_joystick():
-    """Connect to WebSocket server and simulate joystick movements."""
+    """Connect to WebSocket server and send all simulated updates concurrently."""
     try:
         async with websockets.connect(WS_URL) as ws:
             logger.info("Connected to WebSocket server")
             
-            # Simulate joystick movements
-            for i in range(50):  # Send 50 updates
-                # Alternate between single values and X,Y pairs
-                if i % 3 == 0:
-                    # Send single-value format
-                    joystick_values = generate_joystick_values()
-                    message = {
-                        "type": "joystick_update",
-                        "joysticks": joystick_values
-                    }
-                    logger.info(f"Sending single values: {joystick_values}")
-                elif i % 3 == 1:
-                    # Send X,Y pair format
-                    joystick_values = generate_joystick_xy_values()
-                    message = {
-                        "type": "joystick_update",
-                        "joysticks": joystick_values
-                    }
-                    logger.info(f"Sending X,Y pairs: {joystick_values}")
-                else:
-                    # Send LED update
-                    led_values = generate_led_values()
-                    message = {
-                        "type": "led_update",
-                        "leds": led_values
-                    }
-                    logger.info(f"Sending LED values: {led_values}")
-                
-                await ws.send(json.dumps(message))
-                
-                # Sleep to simulate real-time updates
-                await asyncio.sleep(1)
+            # No pacing: every update is queued at once to stress the server
+            await asyncio.gather(*(send_one(i, ws) for i in range(MESSAGE_COUNT)))
                 
             logger.info("Simulation completed")
             
@@ -0,0 +1,79 @@
+"""Tests de la recherche des blocs joystick dans analyze_html.py."""
+
+import contextlib
+import io
+import os
+import re
+import tempfile
+import unittest
+
+import analyze_html
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "serrure.html")
+
+# Regex utilisée avant le parcours linéaire, prise comme référence
+REFERENCE_RE = re.compile(rb'<div\s+class="joystick.*?</div>\s*</div>', re.DOTALL)
+
+
+def reference_spans(content):
+    return [m.span() for m in REFERENCE_RE.finditer(content)]
+
+
+class FindJoystickSpansTest(unittest.TestCase):
+
+    def test_matches_reference_on_template(self):
+        with open(TEMPLATE, "rb") as f:
+            content = f.read()
+
+        spans = analyze_html.find_joystick_spans(content)
+
+        self.assertEqual(len(spans), 9)
+        self.assertEqual(spans, reference_spans(content))
+
+    def test_nested_joystick_divs(self):
+        content = (b'<div class="joystick-container">\n'
+                   b'  <div class="joystick" id="j1"><div class="knob"></div>\n  </div>\n'
+                   b'  <div class="joystick" id="j2"><span></span></div>\n'
+                   b'</div>\n')
+
+        self.assertEqual(analyze_html.find_joystick_spans(content), reference_spans(content))
+
+    def test_unterminated_block(self):
+        content = b'<div class="joystick"><div></div>'
+
+        self.assertEqual(analyze_html.find_joystick_spans(content), [])
+        self.assertEqual(reference_spans(content), [])
+
+
+class AnalyzeHtmlFileTest(unittest.TestCase):
+
+    def run_analysis(self, path):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            result = analyze_html.analyze_html_file(path)
+        return result, out.getvalue()
+
+    def test_positions_are_character_offsets(self):
+        with open(TEMPLATE, encoding="utf-8") as f:
+            text = f.read()
+        expected = re.search(r'function\s+updateJoystickDisplay\s*\(\s*joysticks\s*\)\s*\{', text).start()
+
+        result, output = self.run_analysis(TEMPLATE)
+
+        self.assertTrue(result)
+        self.assertIn(f"updateJoystickDisplay function at position {expected}\n", output)
+
+    def test_empty_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as f:
+            path = f.name
+        try:
+            result, output = self.run_analysis(path)
+        finally:
+            os.unlink(path)
+
+        self.assertTrue(result)
+        self.assertIn("Found 0 joystick elements", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests des correctifs appliqués par start_lockbox.py."""
+
+import importlib.util
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import start_lockbox
+
+# app_game_control.py avant le passage au format X,Y
+OLD_FORMAT_SOURCE = '''import logging
+
+logger = logging.getLogger("OldLockboxController")
+
+
+class Fore:
+    YELLOW = RED = ""
+
+
+class Style:
+    RESET_ALL = ""
+
+
+class LockboxController:
+    def __init__(self):
+        self.joystick_values = {
+            "joystick1": 512,
+            "joystick2": 512,
+            "joystick3": 512
+        }
+        self.joystick_callback = None
+
+    def process_message(self, message):
+        if message.startswith('<') and message.endswith('>'):
+            content = message[1:-1]
+            # Handle joystick data (format: J1023,512,0)
+            if content.startswith('J'):
+                try:
+                    # Parse joystick values
+                    values = content[1:].split(',')
+                    if len(values) == 3:
+                        self.joystick_values["joystick1"] = int(values[0])
+                        self.joystick_values["joystick2"] = int(values[1])
+                        self.joystick_values["joystick3"] = int(values[2])
+
+                        # Call the callback with new joystick data
+                        if self.joystick_callback:
+                            self.joystick_callback(self.joystick_values)
+
+                        logger.debug(f"Joystick values: {self.joystick_values}")
+                    else:
+                        logger.warning(f"{Fore.YELLOW}Unexpected joystick data format: {content}, found {len(values)} values{Style.RESET_ALL}")
+                except Exception as e:
+                    logger.error(f"{Fore.RED}Error parsing joystick data: {e}{Style.RESET_ALL}")
+'''
+
+
+class FixArduinoDataFormatTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name, "app_game_control.py")
+        self.path.write_text(OLD_FORMAT_SOURCE, encoding="utf-8")
+
+        for name, value in (("SERVER_DIR", tmp.name), ("PATCH_STAMP", Path(tmp.name, ".lockbox_patched"))):
+            patcher = mock.patch.object(start_lockbox, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def load_patched_controller(self):
+        self.assertTrue(start_lockbox.fix_arduino_data_format())
+        spec = importlib.util.spec_from_file_location("patched_app_game_control", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.LockboxController()
+
+    def test_parses_xy_frames(self):
+        controller = self.load_patched_controller()
+
+        controller.process_message("<J1,2,3,4,5,6>")
+
+        self.assertEqual(controller.joystick_values["joystick1"], 1)
+        self.assertEqual(controller.joystick_values["joystick2Y"], 4)
+        self.assertEqual(controller.joystick_values["joystick3X"], 5)
+
+    def test_bad_frame_logs_a_warning(self):
+        controller = self.load_patched_controller()
+
+        with self.assertLogs("OldLockboxController", level=logging.WARNING) as logs:
+            controller.process_message("<J1,2,3>")
+
+        self.assertEqual([r.levelno for r in logs.records], [logging.WARNING])
+        self.assertIn("Unexpected joystick data format: J1,2,3", logs.output[0])
+        self.assertEqual(controller.joystick_values["joystick1"], 512)
+
+
+if __name__ == "__main__":
+    unittest.main()
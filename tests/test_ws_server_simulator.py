@@ -0,0 +1,92 @@
+"""Tests du serveur WebSocket avec le simulateur à la place de l'Arduino."""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"))
+
+try:
+    import ws_server
+    from simulation_mode import LockboxSimulator
+except ImportError:  # websockets, pyserial ou colorama absents
+    ws_server = None
+
+
+class FakeConnection:
+    """Connexion WebSocket minimale: rejoue des messages puis reste ouverte."""
+
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.sent = []
+        self.closed = asyncio.Event()
+        self.transport = mock.Mock()
+        self.transport.get_write_buffer_size.return_value = 0
+        self.transport.get_extra_info.return_value = None
+
+    async def __aiter__(self):
+        for message in self.messages:
+            yield message
+        await self.closed.wait()
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    def received(self, message_type):
+        return [m for m in map(json.loads, self.sent) if m["type"] == message_type]
+
+
+def fake_broadcast(connections, message):
+    for connection in connections:
+        connection.sent.append(message)
+
+
+@unittest.skipIf(ws_server is None, "websockets, pyserial ou colorama non installé")
+class SimulatorServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_state_led_and_joystick_updates(self):
+        server = ws_server.LockboxWebSocketServer(host="127.0.0.1", port=0)
+        server.lockbox = LockboxSimulator()
+        listener = mock.Mock(wait_closed=mock.AsyncMock())
+
+        with mock.patch.object(ws_server.websockets, "serve", mock.AsyncMock(return_value=listener)), \
+                mock.patch.object(ws_server.websockets, "broadcast", fake_broadcast), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(await server.start_server())
+            connection = FakeConnection([
+                '{"type":"get_state"}',
+                '{"type":"led_control","leds":{"led1":127.5,"led2":300}}',
+            ])
+            client = asyncio.create_task(server.handle_client(connection, "/"))
+            try:
+                # The simulator ticks every SIMULATION_INTERVAL: wait for a broadcast
+                for _ in range(100):
+                    if connection.received("joystick_update"):
+                        break
+                    await asyncio.sleep(0.02)
+            finally:
+                connection.closed.set()
+                await client
+                await server.stop_server()
+
+        states = connection.received("state")
+        self.assertEqual(len(states), 2)
+        self.assertEqual(tuple(states[0]["joysticks"]), ws_server.JOYSTICK_KEYS)
+        self.assertTrue(states[0]["arduino_connected"])
+
+        self.assertEqual(connection.received("led_update")[0]["leds"], {"led1": 127, "led2": 255, "led3": 0})
+
+        updates = connection.received("joystick_update")
+        self.assertTrue(updates)
+        self.assertEqual(tuple(updates[0]["joysticks"]), ws_server.JOYSTICK_KEYS)
+
+
+if __name__ == "__main__":
+    unittest.main()